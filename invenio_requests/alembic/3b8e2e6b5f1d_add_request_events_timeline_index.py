@@ -0,0 +1,32 @@
+#
+# Copyright (C) 2022 CERN.
+#
+# Invenio-Requests is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Add index on the timeline of request events."""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3b8e2e6b5f1d"
+down_revision = "9ad2f6c1e8b4"
+branch_labels = ()
+depends_on = None
+
+
+def upgrade():
+    """Upgrade database."""
+    op.create_index(
+        "ix_request_events_request_id_created",
+        "request_events",
+        ["request_id", "created"],
+        unique=False,
+    )
+
+
+def downgrade():
+    """Downgrade database."""
+    op.drop_index(
+        "ix_request_events_request_id_created", table_name="request_events"
+    )
@@ -0,0 +1,66 @@
+#
+# Copyright (C) 2022 CERN.
+#
+# Invenio-Requests is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Add activity counters to requests."""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision = "9ad2f6c1e8b4"
+down_revision = "c015aba9fa71"
+branch_labels = ()
+depends_on = None
+
+
+def upgrade():
+    """Upgrade database."""
+    op.add_column(
+        "request_metadata",
+        sa.Column("events_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.add_column(
+        "request_metadata",
+        sa.Column("comments_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.add_column(
+        "request_metadata",
+        sa.Column(
+            "last_activity_at",
+            sa.DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql"),
+            nullable=True,
+        ),
+    )
+
+    # initialize the counters from the existing events
+    op.execute(
+        """
+        UPDATE request_metadata SET
+          events_count = (
+            SELECT count(*) FROM request_events
+            WHERE request_events.request_id = request_metadata.id
+              AND request_events.json IS NOT NULL
+          ),
+          comments_count = (
+            SELECT count(*) FROM request_events
+            WHERE request_events.request_id = request_metadata.id
+              AND request_events.json IS NOT NULL
+              AND request_events.type = 'C'
+          ),
+          last_activity_at = (
+            SELECT max(request_events.created) FROM request_events
+            WHERE request_events.request_id = request_metadata.id
+          )
+        """
+    )
+
+
+def downgrade():
+    """Downgrade database."""
+    op.drop_column("request_metadata", "last_activity_at")
+    op.drop_column("request_metadata", "comments_count")
+    op.drop_column("request_metadata", "events_count")
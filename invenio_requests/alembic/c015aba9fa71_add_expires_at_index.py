@@ -0,0 +1,32 @@
+#
+# Copyright (C) 2022 CERN.
+#
+# Invenio-Requests is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Add index on the expiration date of requests."""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c015aba9fa71"
+down_revision = "a14fa442680f"
+branch_labels = ()
+depends_on = None
+
+
+def upgrade():
+    """Upgrade database."""
+    op.create_index(
+        op.f("ix_request_metadata_expires_at"),
+        "request_metadata",
+        ["expires_at"],
+        unique=False,
+    )
+
+
+def downgrade():
+    """Downgrade database."""
+    op.drop_index(
+        op.f("ix_request_metadata_expires_at"), table_name="request_metadata"
+    )
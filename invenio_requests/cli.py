@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2022 CERN.
+#
+# Invenio-Requests is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Command-line tools for requests."""
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from invenio_access.permissions import system_identity
+
+from .proxies import current_events_service, current_requests_service
+
+
+@click.group()
+def requests():
+    """Requests commands."""
+
+
+@requests.command("expire")
+@click.option(
+    "--batch-size",
+    type=int,
+    default=None,
+    help="Number of requests to expire per chunk.",
+)
+@with_appcontext
+def expire(batch_size):
+    """Expire all open requests whose expiration date has passed."""
+    batch_size = batch_size or current_app.config["REQUESTS_EXPIRE_BATCH_SIZE"]
+    expired = current_requests_service.expire_requests(
+        system_identity, batch_size=batch_size
+    )
+    click.secho(f"Expired {expired} request(s).", fg="green")
+
+
+@requests.command("rebuild-events-index")
+@click.option(
+    "--batch-size",
+    type=int,
+    default=500,
+    help="Number of events to index per bulk request.",
+)
+@click.option(
+    "--recreate",
+    is_flag=True,
+    default=False,
+    help="Delete and recreate the events index before reindexing.",
+)
+@with_appcontext
+def rebuild_events_index(batch_size, recreate):
+    """Reindex the events of all requests."""
+    indexed = current_events_service.rebuild_index(
+        system_identity, batch_size=batch_size, recreate=recreate
+    )
+    click.secho(f"Indexed {indexed} event(s).", fg="green")
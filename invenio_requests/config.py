@@ -12,6 +12,8 @@ from invenio_records_resources.references.resolvers import UserResolver
 
 from invenio_requests.services.requests import facets
 
+from .records.cache import LocalInvalidationChannel
+from .services.events.pubsub import LocalTimelineBroker
 from .services.permissions import PermissionPolicy
 
 REQUESTS_PERMISSION_POLICY = PermissionPolicy
@@ -25,6 +27,125 @@ REQUESTS_ENTITY_RESOLVERS = [
 ]
 """Registered resolvers for resolving/creating references in request metadata."""
 
+REQUESTS_NUMBER_BLOCK_SIZE = 1
+"""Number of request numbers reserved at once per worker process.
+
+With a value of 1 (the default), every request number is drawn from the
+``request_number_seq`` table individually.
+Larger values reserve whole blocks of numbers (hi/lo style), which reduces the
+contention on the sequence table but leaves gaps in the request numbers.
+"""
+
+REQUESTS_NUMBER_BLOCK_MAX_AGE = None
+"""Tolerated age (in seconds) of a partially used block of request numbers.
+
+Once a block is older, its remaining numbers are abandoned (leaving a gap) and
+a new block is reserved, which keeps the numbers handed out by different
+worker processes roughly in chronological order.
+``None`` keeps each block until all of its numbers are used.
+
+Note: The ``invenio_requests.tasks.cleanup_request_numbers`` task can be
+scheduled to remove the left-over rows from the sequence table.
+"""
+
+REQUESTS_NUMBER_CACHE_SIZE = 10000
+"""Maximum number of cached mappings from request numbers to request IDs.
+
+Requests can be looked up by their number instead of their ID (e.g. in the
+REST API), and since numbers never change, the mapping is cached per process.
+A value of 0 disables the cache.
+"""
+
+REQUESTS_RECORD_CACHE_SIZE = 0
+"""Maximum number of requests in the in-process read-through cache.
+
+The cache keeps the JSON data of requests loaded via ``Request.get_record()``.
+Cached data is only used if it matches the current ``version_id`` of the
+request, which is checked with a query that does not load the JSON.
+A value of 0 (the default) disables the cache.
+"""
+
+REQUESTS_RECORD_CACHE_TTL = None
+"""Number of seconds after which requests are removed from the cache.
+
+``None`` keeps requests in the cache until they are evicted or invalidated.
+"""
+
+REQUESTS_RECORD_CACHE_INVALIDATION_CHANNEL = LocalInvalidationChannel
+"""Channel for broadcasting invalidations of cached requests.
+
+The default channel only invalidates the cache of the current process.
+Implementations of ``invenio_requests.records.cache.InvalidationChannel``
+can share the invalidations between processes.
+"""
+
+REQUESTS_EXPIRE_BATCH_SIZE = 500
+"""Number of requests expired per chunk by the expiry sweeper.
+
+The sweeper can be run via the ``invenio_requests.tasks.expire_requests`` task
+or the ``invenio requests expire`` command.
+"""
+
+REQUESTS_INDEX_REFRESH = "coalesced"
+"""How the changes made by the services become visible in the search.
+
+* ``"none"``: with the next periodic refresh of the indices.
+* ``"wait_for"``: the index requests wait for the next periodic refresh.
+* ``"coalesced"``: each index is refreshed once per service operation (e.g.
+  deleting a comment refreshes the events and the requests index once).
+* ``"immediate"``: each index request forces a refresh.
+
+Forced refreshes (``"coalesced"`` and ``"immediate"``) reduce the indexing
+throughput of the cluster under load, but make the changes visible to the
+next search right away.
+"""
+
+REQUESTS_LINKS_RELATIVE = False
+"""Render the links of requests and events without scheme and host.
+
+This makes the links relative to the site (e.g. ``/api/requests/<id>``) and
+the serialized results smaller.
+"""
+
+REQUESTS_TIMELINE_BROKER = LocalTimelineBroker
+"""Publish/subscribe backend for live updates of request timelines.
+
+The default backend only delivers the updates within the same process.
+Deployments with several processes need a backend which shares the messages
+between them (cf. ``invenio_requests.services.events.pubsub``).
+"""
+
+REQUESTS_TIMELINE_STREAM_TIMEOUT = 60
+"""Number of seconds after which timeline streams are closed.
+
+Clients (e.g. ``EventSource`` in browsers) reconnect automatically.
+"""
+
+REQUESTS_TIMELINE_STREAM_KEEPALIVE = 15
+"""Number of seconds after which idle timeline streams send a keep-alive."""
+
+REQUESTS_TIMELINE_FROM_DB = False
+"""Read the timelines of requests from the database instead of the search.
+
+Timelines are then read with keyset pagination from the events table, and
+reflect all changes without having to refresh the search index.
+Timeline searches with queries, incremental fetches (``since``/``after_id``)
+and the search over the events of all requests still use the search index.
+"""
+
+REQUESTS_EVENTS_ROUTING = False
+"""Route the indexed events by the ID of their request.
+
+All events of a request are then kept on the same shard, so that searching
+the timeline of a request only hits that shard.
+The same routing is used for indexing, deleting and searching events.
+
+Events indexed before enabling the routing are not found by routed searches
+(and would be duplicated by routed reindexing), so the events index has to be
+recreated and rebuilt when changing this setting on an existing instance,
+e.g. with ``invenio requests rebuild-events-index --recreate``.
+"""
+
 REQUESTS_ROUTES = {
     'details': '/requests/<pid_value>',
 }
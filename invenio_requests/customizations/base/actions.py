@@ -8,9 +8,18 @@
 
 """Base class for customizable actions on requests."""
 
+import inspect
+
+from invenio_access.permissions import system_process
+
 from ...errors import NoSuchActionError
 
 
+def _is_system_process(identity):
+    """Check if the identity is a system process."""
+    return identity is not None and system_process in identity.provides
+
+
 class RequestAction:
     """Base class for actions on requests."""
 
@@ -23,20 +32,36 @@ class RequestAction:
     event_type = None
     """Defines an event type which will be logged if defined."""
 
+    requires_system_process = False
+    """Whether only system processes can execute this action."""
+
     def __init__(self, request):
         """Constructor."""
         self.request = request
 
+    @classmethod
+    def is_available(cls, status, is_system_process):
+        """Check the prerequisites defined by the class attributes.
+
+        These only depend on the request's status and on whether the executor
+        is a system process.
+        """
+        if cls.requires_system_process and not is_system_process:
+            return False
+
+        return cls.status_from is None or status in cls.status_from
+
     def can_execute(self, identity):
         """Check whether the action can be executed.
 
         This is mostly intended to be a hook for checking prerequisites
         (think, for instance, CI/CD pipeline runs).
+        Note that overriding this method means that the availability of the
+        action has to be checked for each request individually.
         :param identity: The identity of the executor.
         :return: True if the action can be executed, False otherwise.
         """
-        return self.status_from is None or \
-            self.request.status in self.status_from
+        return self.is_available(self.request.status, _is_system_process(identity))
 
     def execute(self, identity, uow):
         """Execute the request action.
@@ -50,6 +75,37 @@ class RequestAction:
 class RequestActions:
     """Namespace for RequestActions static calls."""
 
+    _availability = {}
+    """Precomputed availability of actions per type, status and identity class."""
+
+    @classmethod
+    def _get_availability(cls, identity, request):
+        """Get the precomputed availability of the actions for the request.
+
+        For actions that don't override ``can_execute()``, the availability
+        only depends on the request type, the request's status and whether the
+        identity is a system process, and is computed once per combination.
+        Other actions are mapped to ``None``.
+        """
+        request_type = request.type
+        type_cls = request_type if inspect.isclass(request_type) else type(request_type)
+        is_system_process = _is_system_process(identity)
+        key = (type_cls, request.status, is_system_process)
+
+        availability = cls._availability.get(key)
+        if availability is None:
+            availability = {
+                name: (
+                    action_cls.is_available(request.status, is_system_process)
+                    if action_cls.can_execute is RequestAction.can_execute
+                    else None
+                )
+                for name, action_cls in request_type.available_actions.items()
+            }
+            cls._availability[key] = availability
+
+        return availability
+
     @classmethod
     def get_action(cls, request, action_name):
         """Get the action registered under the given name.
@@ -68,7 +124,12 @@ class RequestActions:
 
         Perhaps data is sometimes useful for that check, so also included.
         """
-        return cls.get_action(request, action_name).can_execute(identity)
+        available = cls._get_availability(identity, request).get(action_name)
+        if available is None:
+            # the action has its own checks (or doesn't exist)
+            return cls.get_action(request, action_name).can_execute(identity)
+
+        return available
 
     @classmethod
     def execute(cls, identity, request, action_name, uow):
@@ -148,10 +148,15 @@ class RequestType:
         This method can be overridden in subclasses to create external identifiers
         according to a custom schema, using the information associated with the request
         (e.g. topic, receiver, creator).
+
+        If a ``sequence_value`` is passed (e.g. pre-allocated for a batch of
+        requests), it is used instead of drawing a new value from the sequence.
         """
-        from invenio_requests.records.models import RequestNumber
+        value = kwargs.get("sequence_value")
+        if value is None:
+            value = current_requests.request_number_allocator.next()
 
-        return base32.encode(RequestNumber.next())
+        return base32.encode(value)
 
     def __str__(self):
         """Return str(self)."""
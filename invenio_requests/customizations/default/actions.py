@@ -9,8 +9,6 @@
 """RequestActions define code to be executed when performing actions on requests."""
 
 
-from invenio_access.permissions import system_process
-
 from ...records.api import RequestEventType
 from ..base import RequestAction
 
@@ -52,8 +50,4 @@ class ExpireAction(RequestAction):
     status_from = ['open']
     status_to = 'expired'
     event_type = RequestEventType.EXPIRED.value
-
-    def can_execute(self, identity):
-        """Check whether the action can be executed."""
-        is_system_process = system_process in identity.provides
-        return super().can_execute(identity) and is_system_process
+    requires_system_process = True
@@ -10,8 +10,13 @@
 """Invenio module for generic and customizable requests."""
 
 import pkg_resources
+from invenio_base.utils import obj_or_import_string
 
 from . import config
+from .records import identity_map
+from .records.allocator import SequenceAllocator
+from .records.cache import LRUCache, RecordCache, register_session_listeners
+from .records.models import RequestNumber
 from .registry import TypeRegistry
 from .resources import (
     RequestCommentsResource,
@@ -35,6 +40,10 @@ class InvenioRequests:
         self.requests_service = None
         self.requests_resource = None
         self.request_comments_service = None
+        self.request_number_allocator = None
+        self.request_number_cache = None
+        self.request_record_cache = None
+        self.timeline_broker = None
         self._schema_cache = {}
         if app:
             self.init_app(app)
@@ -45,6 +54,10 @@ class InvenioRequests:
         self.init_services(app)
         self.init_resources()
         self.init_registry(app)
+        self.init_number_allocator(app)
+        self.init_record_cache(app)
+        self.init_timeline_broker(app)
+        identity_map.register_session_listeners()
         app.extensions["invenio-requests"] = self
 
     def init_config(self, app):
@@ -98,6 +111,38 @@ class InvenioRequests:
             self.entity_resolvers_registry, "invenio_requests.entity_resolvers"
         )
 
+    def init_number_allocator(self, app):
+        """Initialize the allocator and the lookup cache for request numbers."""
+        self.request_number_allocator = SequenceAllocator(
+            RequestNumber,
+            block_size=app.config["REQUESTS_NUMBER_BLOCK_SIZE"],
+            max_age=app.config["REQUESTS_NUMBER_BLOCK_MAX_AGE"],
+        )
+        self.request_number_cache = LRUCache(
+            maxsize=app.config["REQUESTS_NUMBER_CACHE_SIZE"],
+        )
+
+    def init_record_cache(self, app):
+        """Initialize the optional read-through cache for requests."""
+        size = app.config["REQUESTS_RECORD_CACHE_SIZE"]
+        if not size:
+            return
+
+        channel_cls = obj_or_import_string(
+            app.config["REQUESTS_RECORD_CACHE_INVALIDATION_CHANNEL"]
+        )
+        self.request_record_cache = RecordCache(
+            maxsize=size,
+            ttl=app.config["REQUESTS_RECORD_CACHE_TTL"],
+            channel=channel_cls(),
+        )
+        register_session_listeners()
+
+    def init_timeline_broker(self, app):
+        """Initialize the pub/sub backend for live timeline updates."""
+        broker_cls = obj_or_import_string(app.config["REQUESTS_TIMELINE_BROKER"])
+        self.timeline_broker = broker_cls()
+
 
 def register_entry_point(registry, ep_name):
     """Register types from an entry point."""
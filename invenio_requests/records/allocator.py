@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2022 CERN.
+#
+# Invenio-Requests is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Allocation of sequence values in blocks (hi/lo style).
+
+With the default block size of 1, every value is drawn directly from the
+sequence table (one row per value).
+With a larger block size, each process reserves a whole block of values with a
+single row in the sequence table, and hands them out from memory until the
+block is used up.
+This removes the contention on the sequence table between concurrent creators,
+at the cost of gaps in the sequence: values that are still unused when a
+process ends (or when its block is abandoned) are never handed out.
+
+.. code-block:: python
+
+    allocator = SequenceAllocator(RequestNumber, block_size=100)
+    allocator.next()  # e.g. 101
+    allocator.next_many(3)  # [102, 103, 104]
+"""
+
+import os
+import threading
+import time
+
+
+class SequenceAllocator:
+    """Hand out values of an integer sequence, optionally in blocks."""
+
+    def __init__(self, sequence_cls, block_size=1, max_age=None):
+        """Constructor.
+
+        :param sequence_cls: The sequence model (using the ``SequenceMixin``).
+        :param block_size: The number of values to reserve at once.
+                           A value of 1 disables the block allocation.
+        :param max_age: Number of seconds after which a partially used block
+                        is abandoned in favor of a new one (i.e. the tolerated
+                        age of gaps). ``None`` keeps blocks until used up.
+        """
+        self.sequence_cls = sequence_cls
+        self.block_size = max(int(block_size or 1), 1)
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        """Forget the current block."""
+        self._next = None
+        self._last = None
+        self._reserved_at = None
+        self._pid = None
+
+    def _has_valid_block(self):
+        """Check if the current block can still be used."""
+        if self._next is None or self._next > self._last:
+            return False
+
+        # blocks must never be shared with forked worker processes
+        if self._pid != os.getpid():
+            return False
+
+        if self.max_age is not None:
+            return time.monotonic() - self._reserved_at < self.max_age
+
+        return True
+
+    def _reserve(self, size):
+        """Reserve a new block with at least ``size`` values."""
+        first, last = self.sequence_cls.reserve_block(max(size, self.block_size))
+        self._next = first
+        self._last = last
+        self._reserved_at = time.monotonic()
+        self._pid = os.getpid()
+
+    def next(self):
+        """Return the next available value."""
+        return self.next_many(1)[0]
+
+    def next_many(self, count):
+        """Return a list of the next ``count`` available values."""
+        if self.block_size == 1:
+            return self.sequence_cls.next_many(count)
+
+        values = []
+        with self._lock:
+            while len(values) < count:
+                if not self._has_valid_block():
+                    self._reset()
+                    self._reserve(count - len(values))
+
+                take = min(count - len(values), self._last - self._next + 1)
+                values.extend(range(self._next, self._next + take))
+                self._next += take
+
+        return values
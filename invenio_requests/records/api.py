@@ -8,17 +8,25 @@
 
 """API classes for requests in Invenio."""
 
+import uuid
 from enum import Enum
 from functools import partial
 
+from invenio_db import db
 from invenio_records.dumpers import ElasticsearchDumper
 from invenio_records.systemfields import ConstantField, DictField, ModelField
 from invenio_records_resources.records.api import Record
 from invenio_records_resources.records.systemfields import IndexField
+from sqlalchemy import case, or_, update
+from sqlalchemy.orm import defer
 from sqlalchemy.orm.exc import MultipleResultsFound, NoResultFound
 
 from ..customizations.base.states import RequestState as State
-from .dumpers import CalculatedFieldDumperExt
+from ..proxies import current_requests
+from ..utils import is_uuid
+from . import identity_map
+from .cache import RecordCacheInvalidationExt, is_modified_in_session
+from .dumpers import CalculatedFieldDumperExt, ParentRequestDumperExt
 from .models import RequestEventModel, RequestMetadata
 from .systemfields import (
     EntityReferenceField,
@@ -42,6 +50,9 @@ class Request(Record):
     model_cls = RequestMetadata
     """The model class for the request."""
 
+    _extensions = [identity_map.IdentityMapExt(), RecordCacheInvalidationExt()]
+    """Record extensions (identity map and invalidation of the record cache)."""
+
     dumper = ElasticsearchDumper(
         extensions=[
             CalculatedFieldDumperExt("is_closed"),
@@ -95,6 +106,144 @@ class Request(Record):
     is_expired = ExpiredStateCalculatedField("expires_at")
     """Whether or not the request is already expired."""
 
+    events_count = ModelField("events_count")
+    """Number of events on the request (see ``record_activity()``)."""
+
+    comments_count = ModelField("comments_count")
+    """Number of comments on the request (see ``record_activity()``)."""
+
+    last_activity_at = ModelField("last_activity_at")
+    """Time of the latest event on the request (see ``record_activity()``)."""
+
+    def record_activity(
+        self, events=0, comments=0, timestamp=None, increment_version=True
+    ):
+        """Update the activity counters of the request in the database.
+
+        The counters are incremented by the database itself, so concurrent
+        transactions can't overwrite each other's updates and don't conflict
+        with each other.
+        The ``version_id`` is incremented as well, because the counters are
+        part of the request's representation - unless the request is committed
+        afterwards anyway, which increments it once for both changes.
+        The affected attributes of the model are expired, so that they are
+        reloaded (e.g. for indexing) after the update.
+
+        :param events: Change of the number of events.
+        :param comments: Change of the number of comments.
+        :param timestamp: Time of the activity (the latest one is kept).
+        :param increment_version: Increment the ``version_id`` as well. Pass
+                                  ``False`` if the request is committed in
+                                  the same transaction.
+        """
+        table = self.model_cls.__table__
+        values = {
+            "events_count": table.c.events_count + events,
+            "comments_count": table.c.comments_count + comments,
+        }
+        expired = ["events_count", "comments_count", "last_activity_at"]
+        if increment_version:
+            values["version_id"] = table.c.version_id + 1
+            expired.append("version_id")
+        if timestamp is not None:
+            last_activity_at = table.c.last_activity_at
+            is_newer = or_(last_activity_at.is_(None), last_activity_at < timestamp)
+            values["last_activity_at"] = case(
+                [(is_newer, timestamp)], else_=last_activity_at
+            )
+
+        db.session.execute(
+            update(table).where(table.c.id == self.id).values(**values)
+        )
+        db.session.expire(self.model, expired)
+
+    @classmethod
+    def _get_data(cls, obj, cache):
+        """Get the JSON data of the model, via the record cache if enabled.
+
+        With the cache, the model is expected to be loaded without its JSON,
+        which is then only loaded if there is no cached data for the model's
+        current ``version_id``.
+        """
+        # uncommitted changes must neither be cached nor hidden by the cache
+        if (
+            cache is None
+            or db.session.is_modified(obj)
+            or is_modified_in_session(db.session, obj.id)
+        ):
+            return obj.data
+
+        data = cache.get(obj.id, obj.version_id)
+        if data is None:
+            data = obj.data
+            if data is not None:
+                cache.set(obj.id, obj.version_id, data)
+
+        return data
+
+    @classmethod
+    def _get_record_by_id(cls, id_, with_deleted=False):
+        """Retrieve the request by its ID.
+
+        Requests which have already been created or loaded in the current
+        transaction are taken from the identity map.
+        """
+        request = identity_map.lookup(cls, id_)
+        if request is not None:
+            return request
+
+        cache = current_requests.request_record_cache
+        model_cls = cls.model_cls
+        with db.session.no_autoflush:
+            query = model_cls.query
+            if cache is not None:
+                query = query.options(defer(model_cls.json))
+            obj = query.filter_by(id=id_).one()
+            data = cls._get_data(obj, cache)
+
+            if data is None:
+                if not with_deleted:
+                    raise NoResultFound()
+                return cls(data, model=obj)
+
+            request = cls(data, model=obj)
+            identity_map.add(request)
+            return request
+
+    @classmethod
+    def get_record(cls, id_, with_deleted=False):
+        """Retrieve the request by its ID or by its (external) number.
+
+        Numbers are looked up via the unique index on the ``number`` column.
+        Since the number of a request never changes, the mapping from numbers
+        to IDs is cached in-process, so that repeated lookups of the same
+        number are done by primary key.
+        """
+        if is_uuid(id_):
+            return cls._get_record_by_id(id_, with_deleted=with_deleted)
+
+        number = str(id_)
+        cache = current_requests.request_number_cache
+        request_id = cache.get(number)
+        if request_id is not None:
+            try:
+                return cls._get_record_by_id(request_id, with_deleted=with_deleted)
+            except NoResultFound:
+                # e.g. the request was created in a rolled back transaction
+                cache.delete(number)
+
+        with db.session.no_autoflush:
+            query = cls.model_cls.query.filter_by(number=number)
+            if not with_deleted:
+                query = query.filter(cls.model_cls.is_deleted != True)  # noqa
+            obj = query.one()
+
+        cache.set(number, obj.id)
+        request = cls(obj.data, model=obj)
+        if obj.data is not None:
+            identity_map.add(request)
+        return request
+
 
 class RequestEventType(Enum):
     """Request Event type enum."""
@@ -118,6 +267,12 @@ class RequestEvent(Record):
 
     model_cls = RequestEventModel
 
+    _extensions = [identity_map.IdentityMapExt()]
+    """Record extensions (identity map)."""
+
+    dumper = ElasticsearchDumper(extensions=[ParentRequestDumperExt(Request)])
+    """Elasticsearch dumper, including the fields of the event's request."""
+
     # Systemfields
     metadata = None
 
@@ -147,3 +302,37 @@ class RequestEvent(Record):
 
     created_by = EntityReferenceField("created_by", check_referenced)
     """Who created the event."""
+
+    @classmethod
+    def build(cls, data, id_=None, **kwargs):
+        """Create a new event, without adding it to the database session.
+
+        In contrast to ``create()``, no savepoint is opened and no signals are
+        sent, so that many events can be inserted with a single flush later on
+        (cf. ``insert_records()`` in ``invenio_requests.services.uow``).
+        The event is validated when it's inserted.
+        """
+        record = cls(
+            data, model=cls.model_cls(id=id_ or uuid.uuid4(), data=data), **kwargs
+        )
+        for e in cls._extensions:
+            e.pre_create(record)
+        for e in cls._extensions:
+            e.post_create(record)
+        return record
+
+    @classmethod
+    def get_record(cls, id_, with_deleted=False):
+        """Retrieve the event by its ID.
+
+        Events which have already been created or loaded in the current
+        transaction are taken from the identity map.
+        """
+        event = identity_map.lookup(cls, id_)
+        if event is not None:
+            return event
+
+        event = super().get_record(id_, with_deleted=with_deleted)
+        if not event.model.is_deleted:
+            identity_map.add(event)
+        return event
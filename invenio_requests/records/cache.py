@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2022 CERN.
+#
+# Invenio-Requests is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Bounded in-process caches.
+
+Besides a generic :class:`LRUCache`, this module provides the optional
+read-through cache for requests (:class:`RecordCache`), which is used by
+``Request.get_record()``.
+Cached entries are only used if they match the current ``version_id`` of the
+request in the database, which is looked up without loading the request's
+JSON.
+Additionally, entries are invalidated after requests have been committed or
+deleted, via an :class:`InvalidationChannel` which can broadcast the
+invalidations to all processes.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from copy import deepcopy
+
+from flask import current_app, has_app_context
+from invenio_db import db
+from invenio_records.extensions import RecordExtension
+from sqlalchemy import event
+
+
+class LRUCache:
+    """Thread-safe mapping with a bounded size and least-recently-used eviction.
+
+    .. code-block:: python
+
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # 1, "a" is now the most recently used entry
+        cache.set("c", 3)  # evicts "b"
+    """
+
+    def __init__(self, maxsize=1024, ttl=None):
+        """Constructor.
+
+        :param maxsize: The maximum number of entries.
+                        A value of 0 disables the cache.
+        :param ttl: Number of seconds after which entries expire.
+                    ``None`` keeps entries until they are evicted.
+        """
+        self.maxsize = max(int(maxsize or 0), 0)
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Get the value for the key, marking it as recently used."""
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return default
+
+            expires_at, value = self._data[key]
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+
+            return value
+
+    def set(self, key, value):
+        """Set the value for the key, evicting the oldest entry if necessary."""
+        if self.maxsize == 0:
+            return
+
+        expires_at = None
+        if self.ttl is not None:
+            expires_at = time.monotonic() + self.ttl
+
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        """Remove the key from the cache, if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """Remove all entries from the cache."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        """Return the number of entries."""
+        return len(self._data)
+
+
+#
+# Read-through cache for requests
+#
+class InvalidationChannel:
+    """Channel for broadcasting cache invalidations.
+
+    Implementations for sharing invalidations between processes (e.g. via
+    Redis pub/sub) have to deliver each published key to all subscribers in
+    all processes, including the publishing one.
+    """
+
+    def publish(self, key):
+        """Broadcast the invalidation of the given key."""
+        raise NotImplementedError()
+
+    def subscribe(self, callback):
+        """Register a callback, to be called with each invalidated key."""
+        raise NotImplementedError()
+
+
+class LocalInvalidationChannel(InvalidationChannel):
+    """In-memory invalidation channel, limited to the current process."""
+
+    def __init__(self):
+        """Constructor."""
+        self._callbacks = []
+
+    def publish(self, key):
+        """Call all subscribed callbacks with the key."""
+        for callback in self._callbacks:
+            callback(key)
+
+    def subscribe(self, callback):
+        """Register a callback, to be called with each invalidated key."""
+        self._callbacks.append(callback)
+
+
+class RecordCache:
+    """Cache for the JSON data of records, validated by their ``version_id``."""
+
+    def __init__(self, maxsize=1024, ttl=None, channel=None):
+        """Constructor.
+
+        :param maxsize: The maximum number of cached records.
+        :param ttl: Number of seconds after which cached records expire.
+        :param channel: The :class:`InvalidationChannel` to use.
+        """
+        self._cache = LRUCache(maxsize=maxsize, ttl=ttl)
+        self.channel = channel or LocalInvalidationChannel()
+        self.channel.subscribe(self._cache.delete)
+
+    def get(self, id_, version_id):
+        """Get a copy of the cached data, if it matches the ``version_id``."""
+        entry = self._cache.get(str(id_))
+        if entry is None or entry[0] != version_id:
+            return None
+        return deepcopy(entry[1])
+
+    def set(self, id_, version_id, data):
+        """Cache a copy of the data for the given version of the record."""
+        self._cache.set(str(id_), (version_id, deepcopy(data)))
+
+    def invalidate(self, id_):
+        """Invalidate the cached data of the record in all processes."""
+        self.channel.publish(str(id_))
+
+    def clear(self):
+        """Remove all entries from the local cache."""
+        self._cache.clear()
+
+
+#
+# Invalidation
+#
+SESSION_INVALIDATIONS_KEY = "invenio_requests_invalidated_ids"
+"""Key in the ``info`` of the DB session for the IDs of modified records."""
+
+
+def is_modified_in_session(session, id_):
+    """Check if the record was modified in the session's current transaction.
+
+    The data of such records must not be cached before the transaction is
+    committed, because the same ``version_id`` could otherwise be reused
+    with different data after a rollback.
+    """
+    return str(id_) in session.info.get(SESSION_INVALIDATIONS_KEY, ())
+
+
+def _get_record_cache():
+    """Get the configured record cache, if any."""
+    if not has_app_context():
+        return None
+    ext = current_app.extensions.get("invenio-requests")
+    return getattr(ext, "request_record_cache", None)
+
+
+def invalidate_after_commit(session):
+    """Invalidate the records modified in the session (``after_commit`` hook)."""
+    ids = session.info.pop(SESSION_INVALIDATIONS_KEY, None)
+    cache = _get_record_cache()
+    if ids and cache is not None:
+        for id_ in ids:
+            cache.invalidate(id_)
+
+
+def discard_after_rollback(session):
+    """Forget the records modified in the session (``after_rollback`` hook)."""
+    session.info.pop(SESSION_INVALIDATIONS_KEY, None)
+
+
+def register_session_listeners(session=None):
+    """Register the invalidation hooks on the DB session (once)."""
+    session = session or db.session
+    listeners = [
+        ("after_commit", invalidate_after_commit),
+        ("after_rollback", discard_after_rollback),
+    ]
+    for name, listener in listeners:
+        if not event.contains(session, name, listener):
+            event.listen(session, name, listener)
+
+
+class RecordCacheInvalidationExt(RecordExtension):
+    """Record extension for invalidating cached records.
+
+    Committed and deleted records are remembered in the DB session, and are
+    invalidated in the cache after the transaction has been committed.
+    """
+
+    def _mark(self, record):
+        """Remember the record as modified in the current transaction."""
+        if _get_record_cache() is None:
+            return
+
+        invalidated = db.session.info.setdefault(SESSION_INVALIDATIONS_KEY, set())
+        invalidated.add(str(record.id))
+
+    def post_commit(self, record):
+        """Called after a record is committed."""
+        self._mark(record)
+
+    def post_delete(self, record, force=False):
+        """Called after a record is deleted."""
+        self._mark(record)
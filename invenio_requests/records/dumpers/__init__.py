@@ -8,7 +8,10 @@
 """Elasticsearch dumpers, for transforming to and from versions to index."""
 
 from .calculated import CalculatedFieldDumperExt
+from .parent import ParentRequestDumperExt, parent_fields
 
 __all__ = (
     "CalculatedFieldDumperExt",
+    "ParentRequestDumperExt",
+    "parent_fields",
 )
@@ -30,4 +30,5 @@ class CalculatedFieldDumperExt(ElasticsearchDumperExt):
 
     def load(self, data, record_cls):
         """Load the data."""
-        data.pop(self.field)
+        # the field may have been excluded from the document source
+        data.pop(self.field, None)
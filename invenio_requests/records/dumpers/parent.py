@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2022 CERN.
+#
+# Invenio-Requests is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Elasticsearch dumper for the fields of the request an event belongs to."""
+
+from invenio_records.dumpers import ElasticsearchDumperExt
+
+
+def _copy_reference(reference):
+    """Copy the entity reference dictionary (if set)."""
+    return dict(reference) if reference is not None else None
+
+
+def parent_fields(request):
+    """Get the fields of the request which are indexed with its events.
+
+    These are the fields needed for filtering events by the permissions on
+    their requests (and by the requests' type and status).
+    """
+    return {
+        "created_by": _copy_reference(request.get("created_by")),
+        "receiver": _copy_reference(request.get("receiver")),
+        "status": request.get("status"),
+        "type": request.get("type"),
+        "is_open": request.is_open,
+        "is_closed": request.is_closed,
+    }
+
+
+class ParentRequestDumperExt(ElasticsearchDumperExt):
+    """Elasticsearch dumper extension for the fields of an event's request."""
+
+    def __init__(self, request_cls, field="parent"):
+        """Constructor.
+
+        :param request_cls: The request class.
+        :param field: Field into which to dump the request's fields.
+        """
+        super().__init__()
+        self.request_cls = request_cls
+        self.field = field
+
+    def dump(self, record, data):
+        """Dump the data."""
+        # the request's model is shared by the events loaded in the session
+        model = record.model.request if record.model is not None else None
+        if model is None or model.data is None:
+            return
+
+        data[self.field] = parent_fields(self.request_cls(model.data, model=model))
+
+    def load(self, data, record_cls):
+        """Load the data."""
+        data.pop(self.field, None)
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2022 CERN.
+#
+# Invenio-Requests is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Identity map for requests and events, scoped to the DB transaction.
+
+Within a unit of work (i.e. until the DB session is committed or rolled
+back), requests and events that have been created or loaded before are
+reused by ``get_record()`` instead of being loaded again - for instance, the
+request of an action is shared with the events service, the resolvers and
+the permission generators.
+Records are referenced weakly, so that they are only reused as long as they
+are still in use somewhere else (e.g. registered in the unit of work).
+"""
+
+from weakref import WeakValueDictionary
+
+from invenio_db import db
+from invenio_records.extensions import RecordExtension
+from sqlalchemy import event
+
+SESSION_IDENTITY_MAP_KEY = "invenio_requests_identity_map"
+"""Key in the ``info`` of the DB session for the identity map."""
+
+
+def _key(record_cls, id_):
+    """Get the key for the record in the identity map."""
+    return (record_cls.model_cls.__tablename__, str(id_))
+
+
+def get_identity_map(session=None):
+    """Get the identity map of the session's current transaction."""
+    session = session or db.session
+    return session.info.setdefault(SESSION_IDENTITY_MAP_KEY, WeakValueDictionary())
+
+
+def lookup(record_cls, id_):
+    """Get the record with the given ID from the identity map, if present."""
+    return get_identity_map().get(_key(record_cls, id_))
+
+
+def add(record):
+    """Add the (non-deleted) record to the identity map."""
+    get_identity_map()[_key(type(record), record.id)] = record
+
+
+def discard(record):
+    """Remove the record from the identity map."""
+    get_identity_map().pop(_key(type(record), record.id), None)
+
+
+def clear_identity_map(session, *args):
+    """Clear the identity map at the end of the transaction."""
+    session.info.pop(SESSION_IDENTITY_MAP_KEY, None)
+
+
+def register_session_listeners(session=None):
+    """Register the hooks for clearing the identity map on the session (once)."""
+    session = session or db.session
+    for name in ("after_commit", "after_rollback", "after_soft_rollback"):
+        if not event.contains(session, name, clear_identity_map):
+            event.listen(session, name, clear_identity_map)
+
+
+class IdentityMapExt(RecordExtension):
+    """Record extension for keeping created and deleted records in sync."""
+
+    def post_create(self, record):
+        """Called after a record is created."""
+        add(record)
+
+    def post_delete(self, record, force=False):
+        """Called after a record is deleted."""
+        discard(record)
@@ -11,7 +11,7 @@ import uuid
 
 from invenio_db import db
 from invenio_records.models import RecordMetadataBase
-from sqlalchemy import func
+from sqlalchemy import false, func, select, text
 from sqlalchemy.dialects import mysql
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.declarative import declared_attr
@@ -32,6 +32,22 @@ class RequestMetadata(db.Model, RecordMetadataBase):
         db.DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql"),
         default=None,
         nullable=True,
+        index=True,
+    )
+
+    # denormalized activity on the request (i.e. its events), for listings
+    events_count = db.Column(
+        db.Integer, nullable=False, default=0, server_default="0"
+    )
+
+    comments_count = db.Column(
+        db.Integer, nullable=False, default=0, server_default="0"
+    )
+
+    last_activity_at = db.Column(
+        db.DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql"),
+        default=None,
+        nullable=True,
     )
 
     # TODO later
@@ -43,6 +59,10 @@ class RequestEventModel(db.Model, RecordMetadataBase):
     """Request Events model."""
 
     __tablename__ = "request_events"
+    __table_args__ = (
+        # for reading the timeline of a request (in chronological order)
+        db.Index("ix_request_events_request_id_created", "request_id", "created"),
+    )
 
     type = db.Column(db.String(1), nullable=False)
     request_id = db.Column(
@@ -83,18 +103,109 @@ class SequenceMixin:
     @classmethod
     def next(cls):
         """Return next available integer."""
+        return cls.next_many(1)[0]
+
+    @classmethod
+    def next_many(cls, count):
+        """Return a list of the next ``count`` available integers.
+
+        All values are allocated in a single savepoint, instead of one
+        savepoint per value as with repeated calls to ``next()``.
+        """
+        if count <= 0:
+            return []
+
         try:
             with db.session.begin_nested():
-                obj = cls()
-                db.session.add(obj)
-        except IntegrityError:  # pragma: no cover
+                objs = [cls() for _ in range(count)]
+                db.session.add_all(objs)
+        except IntegrityError:
             with db.session.begin_nested():
                 # Someone has likely modified the table without using the
                 # models API. Let's fix the problem.
                 cls._set_sequence(cls.max())
-                obj = cls()
-                db.session.add(obj)
-        return obj.value
+                objs = [cls() for _ in range(count)]
+                db.session.add_all(objs)
+        return sorted(obj.value for obj in objs)
+
+    @classmethod
+    def reserve_block(cls, size, retries=5):
+        """Reserve a block of ``size`` consecutive integers.
+
+        Only a single row (the last value of the block) is inserted to mark the
+        reservation.
+        The reservation is committed in its own transaction on a separate
+        connection, so that it is kept even if the caller's transaction is
+        rolled back - otherwise, the same block could be handed out twice.
+
+        The table is locked while the highest value is read and the marker row
+        is inserted (cf. :meth:`_lock_for_reservation`), so that concurrent
+        reservations (of any size) and inserts via the auto increment can't
+        hand out values of the same block.
+
+        :param size: The number of values to reserve.
+        :param retries: How often to retry on conflicts.
+        :returns: A tuple ``(first, last)`` of the reserved values (inclusive).
+        """
+        table = cls.__table__
+        for attempt in range(retries + 1):
+            try:
+                with db.engine.begin() as conn:
+                    cls._lock_for_reservation(conn)
+                    current = conn.execute(select([func.max(table.c.value)]))
+                    current = current.scalar() or 0
+                    last = current + size
+                    conn.execute(table.insert().values(value=last))
+                    if conn.dialect.name == "postgresql":  # pragma: no cover
+                        conn.execute(
+                            text(
+                                "SELECT setval(pg_get_serial_sequence("
+                                f"'{cls.__tablename__}', 'value'), :newval)"
+                            ),
+                            {"newval": last},
+                        )
+                return current + 1, last
+            except IntegrityError:  # pragma: no cover
+                if attempt >= retries:
+                    raise
+
+    @classmethod
+    def _lock_for_reservation(cls, conn):
+        """Lock the table until the end of the connection's transaction.
+
+        * PostgreSQL: the table is locked in ``EXCLUSIVE`` mode, which waits for
+          and blocks all other writes (but not reads).
+        * MySQL: the highest row and the gap above it are locked via
+          ``SELECT ... FOR UPDATE``, which blocks inserts of higher values.
+        * SQLite: the database's write lock is acquired with an empty delete.
+        """
+        table = cls.__table__
+        dialect = conn.dialect.name
+        if dialect == "postgresql":  # pragma: no cover
+            conn.execute(text(f"LOCK TABLE {cls.__tablename__} IN EXCLUSIVE MODE"))
+        elif dialect == "mysql":  # pragma: no cover
+            conn.execute(
+                select([table.c.value])
+                .order_by(table.c.value.desc())
+                .limit(1)
+                .with_for_update()
+            )
+        elif dialect == "sqlite":
+            conn.execute(table.delete().where(false()))
+
+    @classmethod
+    def cleanup(cls):
+        """Delete all rows except for the one holding the highest value.
+
+        Only the highest value is needed to continue the sequence, all other
+        rows are just left-overs from previous allocations.
+
+        :returns: The number of deleted rows.
+        """
+        max_value = cls.max()
+        return cls.query.filter(cls.value < max_value).delete(
+            synchronize_session=False
+        )
 
     @classmethod
     def max(cls):
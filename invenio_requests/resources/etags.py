@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2022 CERN.
+#
+# Invenio-Requests is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Helpers for conditional reads via entity tags."""
+
+from flask import make_response
+from werkzeug.http import quote_etag
+
+
+def with_etag(response, etag):
+    """Set the (weak) entity tag on the response."""
+    response.headers["ETag"] = quote_etag(etag, weak=True)
+    return response
+
+
+def not_modified(etag):
+    """Create a ``304 Not Modified`` response for the entity tag."""
+    return with_etag(make_response("", 304), etag)
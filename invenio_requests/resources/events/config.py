@@ -9,10 +9,23 @@
 
 """RequestEvent Resource Configuration."""
 
-from invenio_records_resources.resources import RecordResourceConfig
+import marshmallow as ma
+from invenio_records_resources.resources import (
+    RecordResourceConfig,
+    SearchRequestArgsSchema,
+)
 from marshmallow import fields
 
 
+class RequestEventsSearchRequestArgsSchema(SearchRequestArgsSchema):
+    """Search (i.e. timeline) URL query string arguments."""
+
+    fields = ma.fields.String()
+    cursor = ma.fields.String()
+    since = ma.fields.DateTime()
+    after_id = ma.fields.String()
+
+
 class RequestCommentsResourceConfig(RecordResourceConfig):
     """Request Events resource configuration."""
 
@@ -22,6 +35,7 @@ class RequestCommentsResourceConfig(RecordResourceConfig):
         "list": "/<request_id>/comments",
         "item": "/<request_id>/comments/<comment_id>",
         "timeline": "/<request_id>/timeline",
+        "stream": "/<request_id>/timeline/stream",
     }
 
     # Input
@@ -35,3 +49,5 @@ class RequestCommentsResourceConfig(RecordResourceConfig):
         "request_id": fields.Str(),
         "comment_id": fields.Str(),
     }
+
+    request_search_args = RequestEventsSearchRequestArgsSchema
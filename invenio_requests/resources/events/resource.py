@@ -11,7 +11,7 @@
 
 from copy import deepcopy
 
-from flask import g
+from flask import Response, current_app, g, json, request, stream_with_context
 from flask_resources import (
     from_conf,
     request_body_parser,
@@ -25,6 +25,7 @@ from invenio_records_resources.resources.records.resource import request_headers
 from invenio_records_resources.resources.records.utils import es_preference
 
 from ...records.api import RequestEventType
+from ..etags import not_modified, with_etag
 
 
 #
@@ -58,6 +59,7 @@ class RequestCommentsResource(RecordResource):
             route("PUT", routes["item"], self.update),
             route("DELETE", routes["item"], self.delete),
             route("GET", routes["timeline"], self.search),
+            route("GET", routes["stream"], self.stream),
         ]
 
     @list_view_args_parser
@@ -75,18 +77,25 @@ class RequestCommentsResource(RecordResource):
         return item.to_dict(), 201
 
     @item_view_args_parser
-    @response_handler()
     def read(self):
         """Read an event.
 
         Because each event has a unique id, we can disregard the request_id
         for now.
+        If the ``If-None-Match`` header matches the current entity tag, the
+        event is neither loaded nor serialized (``304 Not Modified``).
         """
-        item = self.service.read(
-            identity=g.identity,
-            id_=resource_requestctx.view_args["comment_id"],
+        id_ = resource_requestctx.view_args["comment_id"]
+
+        etag = self.service.read_etag(g.identity, id_)
+        if etag is not None and request.if_none_match.contains_weak(etag):
+            return not_modified(etag)
+
+        item = self.service.read(identity=g.identity, id_=id_)
+        return with_etag(
+            resource_requestctx.response_handler.make_response(item.to_dict(), 200),
+            item.etag,
         )
-        return item.to_dict(), 200
 
     @item_view_args_parser
     @request_headers
@@ -128,3 +137,32 @@ class RequestCommentsResource(RecordResource):
             es_preference=es_preference(),
         )
         return hits.to_dict(), 200
+
+    @list_view_args_parser
+    def stream(self):
+        """Stream the changes of the timeline as server-sent events.
+
+        Each changed event is sent with the kind of change (``created``,
+        ``updated`` or ``deleted``) as the SSE event type and the serialized
+        event as data.
+        """
+        changes = self.service.stream(
+            identity=g.identity,
+            request_id=resource_requestctx.view_args["request_id"],
+            timeout=current_app.config["REQUESTS_TIMELINE_STREAM_TIMEOUT"],
+            keepalive=current_app.config["REQUESTS_TIMELINE_STREAM_KEEPALIVE"],
+        )
+
+        def _generate():
+            for change in changes:
+                if change is None:
+                    yield ": keep-alive\n\n"
+                else:
+                    kind, data = change
+                    yield f"event: {kind}\ndata: {json.dumps(data)}\n\n"
+
+        return Response(
+            stream_with_context(_generate()),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
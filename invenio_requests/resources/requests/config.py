@@ -30,6 +30,9 @@ class RequestSearchRequestArgsSchema(SearchRequestArgsSchema):
     topic = ReferenceString()
     receiver = ReferenceString()
     is_open = fields.Boolean()
+    ids = fields.List(fields.String())
+    fields = ma.fields.String()
+    cursor = ma.fields.String()
 
 
 #
@@ -42,6 +45,7 @@ class RequestsResourceConfig(RecordResourceConfig):
     url_prefix = "/requests"
     routes = {
         "list": "/",
+        "export": "/export",
         "item": "/<id>",
         "action": "/<id>/actions/<action>",
     }
@@ -51,4 +55,8 @@ class RequestsResourceConfig(RecordResourceConfig):
         "action": ma.fields.Str(),
     }
 
+    request_read_args = {
+        "fields": ma.fields.String(),
+    }
+
     request_search_args = RequestSearchRequestArgsSchema
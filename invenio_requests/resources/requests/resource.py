@@ -10,17 +10,20 @@
 """Requests resource."""
 
 
-from flask import g
+from flask import Response, g, json, request, stream_with_context
 from flask_resources import resource_requestctx, response_handler, route
 from invenio_records_resources.resources import RecordResource
 from invenio_records_resources.resources.records.resource import (
     request_data,
     request_headers,
+    request_read_args,
     request_search_args,
     request_view_args,
 )
 from invenio_records_resources.resources.records.utils import es_preference
 
+from ..etags import not_modified, with_etag
+
 
 #
 # Resource
@@ -33,6 +36,7 @@ class RequestsResource(RecordResource):
         routes = self.config.routes
         return [
             route("GET", routes["list"], self.search),
+            route("GET", routes["export"], self.export),
             route("GET", routes["item"], self.read),
             route("PUT", routes["item"], self.update),
             route("DELETE", routes["item"], self.delete),
@@ -43,7 +47,20 @@ class RequestsResource(RecordResource):
     @request_view_args
     @response_handler(many=True)
     def search(self):
-        """Perform a search over the items."""
+        """Perform a search over the items.
+
+        If the ``ids`` parameter is given, the requests with the given IDs or
+        numbers are looked up directly instead.
+        """
+        ids = resource_requestctx.args.get("ids")
+        if ids:
+            hits = self.service.read_many(
+                identity=g.identity,
+                ids_or_numbers=ids,
+                fields=resource_requestctx.args.get("fields"),
+            )
+            return hits.to_dict(), 200
+
         hits = self.service.search(
             identity=g.identity,
             params=resource_requestctx.args,
@@ -51,15 +68,46 @@ class RequestsResource(RecordResource):
         )
         return hits.to_dict(), 200
 
+    @request_search_args
+    def export(self):
+        """Stream all requests matching the search as newline-delimited JSON.
+
+        In contrast to the search, the results are not paginated.
+        """
+        hits = self.service.export(
+            identity=g.identity,
+            params=resource_requestctx.args,
+            es_preference=es_preference(),
+        )
+
+        def _generate():
+            for hit in hits.hits:
+                yield json.dumps(hit) + "\n"
+
+        return Response(
+            stream_with_context(_generate()), mimetype="application/x-ndjson"
+        )
+
+    @request_read_args
     @request_view_args
-    @response_handler()
     def read(self):
-        """Read an item."""
-        item = self.service.read(
-            id_=resource_requestctx.view_args["id"],
-            identity=g.identity,
+        """Read an item.
+
+        If the ``If-None-Match`` header matches the current entity tag, the
+        request is neither loaded nor serialized (``304 Not Modified``).
+        """
+        id_ = resource_requestctx.view_args["id"]
+        fields = resource_requestctx.args.get("fields")
+
+        etag = self.service.read_etag(g.identity, id_, fields=fields)
+        if etag is not None and request.if_none_match.contains_weak(etag):
+            return not_modified(etag)
+
+        item = self.service.read(id_=id_, identity=g.identity, fields=fields)
+        return with_etag(
+            resource_requestctx.response_handler.make_response(item.to_dict(), 200),
+            item.etag,
         )
-        return item.to_dict(), 200
 
     @request_headers
     @request_view_args
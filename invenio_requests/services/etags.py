@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2022 CERN.
+#
+# Invenio-Requests is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Entity tags for conditional reads of requests and events.
+
+The serialization of a request depends not only on its revision, but also on
+the identity reading it (e.g. the available action links).
+Thus, the entity tag combines the revision ID with a fingerprint of the
+identity's needs.
+
+Entity tags are signed with the application's secret key, so that they can't
+be forged by clients: a client can only present a valid entity tag if it has
+been allowed to read this revision of the object before, with the same needs.
+This way, the current entity tag can be compared without loading the object
+and checking the permissions.
+"""
+
+import hashlib
+import hmac
+import json
+
+from flask import current_app
+
+
+def permission_fingerprint(identity):
+    """Get a fingerprint of the needs provided by the identity."""
+    needs = sorted(repr(need) for need in identity.provides)
+    return hashlib.sha256(json.dumps(needs).encode("utf-8")).hexdigest()
+
+
+def make_etag(identity, revisions, variant=None):
+    """Create the entity tag for the given revisions of objects.
+
+    :param identity: The identity reading the objects.
+    :param revisions: A list of ``(id, revision_id)`` tuples of the objects
+                      which make up the representation (e.g. an event and
+                      the request it belongs to).
+    :param variant: Optional JSON-serializable value identifying the variant
+                    of the representation (e.g. the requested fields).
+    :returns: The (unquoted) entity tag.
+    """
+    message = json.dumps(
+        [
+            [[str(id_), revision_id] for id_, revision_id in revisions],
+            permission_fingerprint(identity),
+            variant,
+        ]
+    )
+    secret_key = current_app.config["SECRET_KEY"]
+    if isinstance(secret_key, str):
+        secret_key = secret_key.encode("utf-8")
+    signature = hmac.new(secret_key, message.encode("utf-8"), hashlib.sha256)
+
+    revision_id = revisions[0][1]
+    return f"{revision_id}-{signature.hexdigest()[:32]}"
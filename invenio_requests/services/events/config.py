@@ -9,28 +9,140 @@
 
 """Request Events Service Config."""
 
-from invenio_records_resources.services import Link, RecordServiceConfig
+from invenio_records_resources.services import RecordServiceConfig, SearchOptions
 from invenio_records_resources.services.records.components import DataComponent
-from invenio_records_resources.services.records.links import pagination_links
-from invenio_records_resources.services.records.results import RecordItem
+from invenio_records_resources.services.records.results import RecordItem, RecordList
 
 from ...records.api import Request, RequestEvent
 from ..configurator import ConfiguratorMixin, FromConfig
+from ..etags import make_etag
+from ..fieldsets import parse_fields, requested_links, top_level_fields
+from ..links import CompiledLink, cursor_pagination_links
 from ..permissions import PermissionPolicy
 from ..requests.components import EntityReferencesComponent
+from ..requests.params import CursorParam, SourceFieldsParam
 from ..schemas import RequestEventSchema
+from ..search import CursorPagination, next_cursor
+from .indexer import RequestEventIndexer
+from .params import SinceParam
+from .timeline import TimelinePage
 
 
 class RequestEventItem(RecordItem):
     """RequestEvent result item."""
 
+    def __init__(self, *args, request=None, **kwargs):
+        """Constructor.
+
+        :param request: The request of the event (needed for the ``etag``).
+        """
+        super().__init__(*args, **kwargs)
+        self._request = request
+
     @property
     def id(self):
         """Id property."""
         return self._record.id
 
+    @property
+    def etag(self):
+        """Entity tag for this revision of the event, as seen by the identity."""
+        request = self._request or self._service._get_request(
+            self._record.request_id
+        )
+        return make_etag(
+            self._identity,
+            [
+                (self._record.id, self._record.revision_id),
+                (request.id, request.revision_id),
+            ],
+        )
+
+
+class RequestEventList(RecordList):
+    """RequestEvent result list, with support for sparse fieldsets and cursors.
+
+    The results are either search results, or a page of a timeline read from
+    the database (:class:`~.timeline.TimelinePage`).
+    """
+
+    def _records(self):
+        """Iterator over the events of the results."""
+        if isinstance(self._results, TimelinePage):
+            yield from self._results.records
+            return
+
+        for hit in self._results:
+            # Load dump
+            yield self._service.record_cls.loads(hit.to_dict())
+
+    @property
+    def total(self):
+        """Get total number of hits."""
+        if isinstance(self._results, TimelinePage):
+            return self._results.total
+        return super().total
+
+    @property
+    def hits(self):
+        """Iterator over the hits."""
+        fields = parse_fields(self._params.get("fields")) if self._params else None
+        keys = top_level_fields(fields) if fields is not None else None
+        link_keys = requested_links(fields) if fields is not None else None
+        for record in self._records():
+            # Project the record, limited to the requested fields (if any)
+            projection = self._schema.dump(
+                record,
+                context=dict(
+                    identity=self._identity,
+                    record=record,
+                ),
+            )
+            if keys is not None:
+                projection = {k: v for k, v in projection.items() if k in keys}
+            if self._links_item_tpl and link_keys != set():
+                links = self._links_item_tpl.expand(record)
+                if link_keys is not None:
+                    links = {k: v for k, v in links.items() if k in link_keys}
+                projection["links"] = links
 
-class RequestEventLink(Link):
+            yield projection
+
+    @property
+    def next_cursor(self):
+        """Cursor for fetching the next page via the ``cursor`` parameter."""
+        if isinstance(self._results, TimelinePage):
+            return self._results.next_cursor
+        return next_cursor(self._results, self._params.get("size"))
+
+    @property
+    def pagination(self):
+        """Create a pagination object."""
+        return CursorPagination(
+            self._params["size"],
+            self._params["page"],
+            self.total,
+            next_cursor=self.next_cursor,
+        )
+
+
+class RequestEventSearchOptions(SearchOptions):
+    """Search options."""
+
+    params_interpreters_cls = SearchOptions.params_interpreters_cls + [
+        SourceFieldsParam.factory(
+            # needed for loading the events from the hits
+            required_fields=[
+                "$schema", "id", "uuid", "version_id", "created", "updated",
+                "type", "request_id",
+            ],
+        ),
+        SinceParam,
+        CursorParam,
+    ]
+
+
+class RequestEventLink(CompiledLink):
     """Link variables setter for RequestEvent links."""
 
     @staticmethod
@@ -48,14 +160,20 @@ class RequestEventsServiceConfig(RecordServiceConfig, ConfiguratorMixin):
     )
     schema = RequestEventSchema
     record_cls = RequestEvent
+    indexer_cls = RequestEventIndexer
+    timeline_from_db = FromConfig("REQUESTS_TIMELINE_FROM_DB", default=False)
     components = [
         DataComponent,
         EntityReferencesComponent,  # only used for created_by
     ]
     result_item_cls = RequestEventItem
+    result_list_cls = RequestEventList
+    search = RequestEventSearchOptions
 
     # ResultItem configurations
     links_item = {
         "self": RequestEventLink("{+api}/requests/{request_id}/comments/{id}"),
     }
-    links_search = pagination_links("{+api}/requests/{request_id}/timeline{?args*}")
+    links_search = cursor_pagination_links(
+        "{+api}/requests/{request_id}/timeline{?args*}"
+    )
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2022 CERN.
+#
+# Invenio-Requests is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Indexer for request events, with optional routing by request.
+
+If ``REQUESTS_EVENTS_ROUTING`` is enabled, events are indexed, deleted and
+searched with the ID of their request as routing key, so that all events of
+a request are kept on the same shard and a timeline search only hits that
+shard instead of all of them.
+"""
+
+from flask import current_app
+from invenio_db import db
+from invenio_indexer.api import RecordIndexer
+from invenio_search import current_search
+from invenio_search.utils import build_alias_name
+
+
+def routing_enabled():
+    """Check if the events are routed by their request."""
+    return bool(current_app.config.get("REQUESTS_EVENTS_ROUTING", False))
+
+
+def events_routing(request_ids):
+    """Get the routing value for the events of the given requests.
+
+    :returns: The routing value, or ``None`` if routing is disabled.
+    """
+    if not routing_enabled():
+        return None
+    return ",".join(sorted({str(request_id) for request_id in request_ids}))
+
+
+class RequestEventIndexer(RecordIndexer):
+    """Indexer for request events, routing them by their request if enabled."""
+
+    @staticmethod
+    def _routing(record):
+        """Get the routing value for the event, if routing is enabled."""
+        if not routing_enabled():
+            return None
+
+        # the column is also set for events whose data has been deleted
+        request_id = record.model.request_id if record.model is not None else None
+        return str(request_id or record["request_id"])
+
+    def _prepare_record(self, record, index, doc_type, arguments=None, **kwargs):
+        """Prepare the event for indexing (single and bulk requests)."""
+        data = super()._prepare_record(
+            record, index, doc_type, arguments=arguments, **kwargs
+        )
+        routing = self._routing(record)
+        if routing is not None and arguments is not None:
+            arguments["routing"] = routing
+        return data
+
+    def delete(self, record, **kwargs):
+        """Delete the event from the index."""
+        routing = self._routing(record)
+        if routing is not None:
+            kwargs.setdefault("routing", routing)
+        return super().delete(record, **kwargs)
+
+    def _delete_action(self, payload):
+        """Bulk delete action (e.g. for ``bulk_delete()``)."""
+        action = super()._delete_action(payload)
+        if routing_enabled():
+            request_id = payload.get("request_id")
+            if request_id is None:
+                model_cls = self.record_cls.model_cls
+                request_id = (
+                    db.session.query(model_cls.request_id)
+                    .filter(model_cls.id == payload["id"])
+                    .scalar()
+                )
+            if request_id is not None:
+                action["routing"] = str(request_id)
+        return action
+
+    def recreate_index(self):
+        """Delete the events index and create it anew, with its aliases.
+
+        This is needed when enabling or disabling the routing on an existing
+        instance. The events have to be reindexed afterwards.
+
+        :returns: The name of the new index.
+        """
+        index = self.record_cls.index
+        write_alias = build_alias_name(index._name)
+        if self.client.indices.exists_alias(name=write_alias):
+            old_indices = self.client.indices.get_alias(name=write_alias)
+            self.client.indices.delete(index=",".join(old_indices))
+
+        (new_index, _), _ = current_search.create_index(index._name)
+        self.client.indices.put_alias(
+            index=new_index, name=build_alias_name(index.search_alias)
+        )
+        return new_index
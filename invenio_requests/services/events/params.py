@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2022 CERN.
+#
+# Invenio-Requests is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Search parameter interpreters for request events."""
+
+from datetime import datetime
+
+from elasticsearch import VERSION as ES_VERSION
+from elasticsearch_dsl import Q
+from invenio_db import db
+from invenio_records_resources.services.errors import QuerystringValidationError
+from invenio_records_resources.services.records.params import ParamInterpreter
+
+from ...records.api import RequestEvent
+from ...utils import is_uuid
+
+
+class SinceParam(ParamInterpreter):
+    """Evaluates the 'since' and 'after_id' parameters, for incremental fetches.
+
+    Only events which have been created or updated after the given timestamp
+    (``since``) or after the given event (``after_id``) are matched, sorted
+    ascending by their last update.
+    If both parameters are given, ``after_id`` breaks the ties between events
+    updated at exactly the ``since`` timestamp.
+
+    The timestamps in the database have microseconds, so ``updated`` is
+    indexed as ``date_nanos`` (Elasticsearch 7+).
+    With the millisecond precision of the ``date`` type (Elasticsearch 6),
+    ``since`` is truncated to milliseconds as well, so that the filter
+    matches the order of the indexed values.
+    """
+
+    @staticmethod
+    def _truncate(since):
+        """Truncate the timestamp to the precision of the indexed values."""
+        if ES_VERSION[0] >= 7 or not isinstance(since, datetime):
+            return since
+        return since.replace(microsecond=since.microsecond // 1000 * 1000)
+
+    def _get_updated(self, event_id):
+        """Get the timestamp of the last update of the event."""
+        model_cls = RequestEvent.model_cls
+        updated = None
+        if is_uuid(event_id):
+            updated = (
+                db.session.query(model_cls.updated)
+                .filter(model_cls.id == event_id)
+                .scalar()
+            )
+
+        if updated is None:
+            raise QuerystringValidationError("Invalid 'after_id' parameter.")
+        return updated
+
+    def apply(self, identity, search, params):
+        """Evaluate the since and after_id parameters on the search."""
+        since = params.get("since")
+        after_id = params.get("after_id")
+        if not since and not after_id:
+            return search
+
+        if after_id:
+            after_id = str(after_id)
+            if not since:
+                since = self._get_updated(after_id)
+            since = self._truncate(since)
+
+            search = search.filter(
+                Q("range", updated={"gt": since})
+                | (
+                    Q("range", updated={"gte": since, "lte": since})
+                    & Q("range", uuid={"gt": after_id})
+                )
+            )
+        else:
+            search = search.filter("range", updated={"gt": self._truncate(since)})
+
+        # the oldest changes first, with a deterministic order for equal times
+        return search.sort("updated", "uuid")
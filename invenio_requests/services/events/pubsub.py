@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2022 CERN.
+#
+# Invenio-Requests is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Publish/subscribe backends for live updates of request timelines.
+
+Whenever a transaction creating, updating or deleting events has been
+committed, a message is published on the channel of the event's request.
+The messages are plain dictionaries:
+
+.. code-block:: python
+
+    {"request_id": "<request-uuid>", "event_id": "<event-uuid>", "change": "created"}
+
+The backend is configured via ``REQUESTS_TIMELINE_BROKER``.
+"""
+
+import queue
+import threading
+
+
+class Subscription:
+    """Subscription to the messages of a channel."""
+
+    def get(self, timeout=None):
+        """Wait for the next message.
+
+        :param timeout: Number of seconds to wait at most.
+        :returns: The message, or ``None`` if there was none within the timeout.
+        """
+        raise NotImplementedError()
+
+    def close(self):
+        """Stop receiving messages."""
+        raise NotImplementedError()
+
+    def __enter__(self):
+        """Enter the context (the subscription is closed when leaving)."""
+        return self
+
+    def __exit__(self, *args):
+        """Close the subscription."""
+        self.close()
+
+
+class TimelineBroker:
+    """Broker for the messages about changed timelines.
+
+    Implementations for sharing the messages between processes (e.g. via
+    Redis pub/sub) have to deliver each published message to all subscribers
+    of the channel in all processes, including the publishing one.
+    """
+
+    def publish(self, channel, message):
+        """Publish the message to all subscribers of the channel."""
+        raise NotImplementedError()
+
+    def subscribe(self, channel):
+        """Subscribe to the messages of the channel.
+
+        :returns: A :class:`Subscription`.
+        """
+        raise NotImplementedError()
+
+
+class LocalSubscription(Subscription):
+    """Subscription to a channel of a :class:`LocalTimelineBroker`."""
+
+    def __init__(self, broker, channel, maxsize=0):
+        """Constructor."""
+        self._broker = broker
+        self._channel = channel
+        self._queue = queue.Queue(maxsize=maxsize)
+
+    def put(self, message):
+        """Deliver a message to the subscriber (dropped if the queue is full)."""
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            pass
+
+    def get(self, timeout=None):
+        """Wait for the next message."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        """Stop receiving messages."""
+        self._broker._unsubscribe(self._channel, self)
+
+
+class LocalTimelineBroker(TimelineBroker):
+    """In-memory broker, limited to the current process.
+
+    This is suitable for tests and for deployments with a single process.
+    """
+
+    def __init__(self, max_queue_size=1000):
+        """Constructor.
+
+        :param max_queue_size: Maximum number of undelivered messages kept per
+                               subscriber (further messages are dropped).
+        """
+        self._subscriptions = {}
+        self._lock = threading.Lock()
+        self._max_queue_size = max_queue_size
+
+    def publish(self, channel, message):
+        """Publish the message to all subscribers of the channel."""
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            subscription.put(message)
+
+    def subscribe(self, channel):
+        """Subscribe to the messages of the channel."""
+        subscription = LocalSubscription(self, channel, self._max_queue_size)
+        with self._lock:
+            self._subscriptions.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def _unsubscribe(self, channel, subscription):
+        """Remove the subscription from the channel."""
+        with self._lock:
+            subscriptions = self._subscriptions.get(channel)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[channel]
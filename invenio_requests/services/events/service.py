@@ -9,16 +9,31 @@
 
 """RequestEvents Service."""
 
+import copy
+import time
+from datetime import datetime
+
 from invenio_access.permissions import system_process
+from invenio_db import db
 from invenio_records_resources.services import RecordService
 from invenio_records_resources.services.base.links import LinksTemplate
-from invenio_records_resources.services.uow import (
+from invenio_records_resources.services.errors import PermissionDeniedError
+from invenio_records_resources.services.uow import unit_of_work
+from sqlalchemy.orm.exc import NoResultFound
+
+from ...proxies import current_requests, current_requests_service
+from ...records.api import RequestEventType
+from ..etags import make_etag
+from ..uow import (
+    RecordBulkInsertOp,
     RecordCommitOp,
     RecordDeleteOp,
-    unit_of_work,
+    RecordIndexOp,
+    TimelinePublishOp,
+    index_records,
 )
-
-from ...records.api import RequestEventType
+from .indexer import events_routing
+from .timeline import read_timeline, supports_params
 
 
 class RequestEventsService(RecordService):
@@ -33,20 +48,108 @@ class RequestEventsService(RecordService):
         :param dict data: Input data according to the data schema.
         """
         request = self._get_request(request_id)
+        record = self._create_event(identity, request, data, uow=uow)
+
+        # Persist record (DB and index)
+        uow.register(RecordCommitOp(record, indexer=self.indexer))
+        uow.register(TimelinePublishOp([record], "created"))
+        self._record_activity(request, [record], uow=uow)
+
+        return self.result_item(
+            self,
+            identity,
+            record,
+            links_tpl=self.links_item_tpl,
+        )
+
+    @unit_of_work()
+    def create_many(self, identity, request_id, events, uow=None):
+        """Create many events for a request at once.
+
+        In contrast to calling ``create()`` for each event, the request is
+        fetched only once, the permission is checked once per event type,
+        all events are validated with a single schema instance before any of
+        them is created, inserted with a single flush and indexed with a
+        single bulk request.
+
+        :param request_id: Identifier of the request (data-layer id).
+        :param identity: Identity of user creating the events.
+        :param list events: Input data for each event, as for ``create()``.
+        """
+        request = self._get_request(request_id)
+
+        events = list(events)
+        types = {data["type"] for data in events}
+        for permission in sorted({self._get_permission("create", t) for t in types}):
+            self.require_permission(identity, permission, request=request)
+
+        creator = self._get_creator(identity)
+        records = self._build_events(
+            identity, request, [(data, creator, None) for data in events], uow=uow
+        )
+        return self._persist_events(identity, request, records, uow=uow)
+
+    @unit_of_work()
+    def import_many(self, identity, request_id, items, uow=None):
+        """Import events with their original creators and creation times.
+
+        This is meant for migrating existing discussions (e.g. from other
+        systems) and only allowed for system processes.
+        The events are created as with ``create_many()``.
+
+        :param request_id: Identifier of the request (data-layer id).
+        :param identity: Identity of the system process.
+        :param list items: Dictionaries with the key ``data`` (the input data,
+                           as for ``create()``), and optionally ``created_by``
+                           (a reference dict like ``{"user": "1"}``) and
+                           ``created`` (a naive UTC ``datetime``).
+        """
+        request = self._get_request(request_id)
+        self.require_permission(identity, "import_event", request=request)
+
+        items = list(items)
+        for idx, item in enumerate(items):
+            if "data" not in item:
+                raise ValueError(f"Item {idx} is missing the key: data")
+
+        records = self._build_events(
+            identity,
+            request,
+            [
+                (item["data"], item.get("created_by"), item.get("created"))
+                for item in items
+            ],
+            uow=uow,
+        )
+        return self._persist_events(identity, request, records, uow=uow)
+
+    def _create_event(self, identity, request, data, uow=None, validated=False):
+        """Create an event for the request and run the components.
+
+        The event is not registered for persistence in the unit of work, which
+        is left to the caller.
+
+        :param validated: If the data has already been loaded with the schema
+                          (e.g. once for the same comment on many requests).
+        """
         permission = self._get_permission("create", data["type"])
         self.require_permission(identity, permission, request=request)
 
-        # Validate data (if there are errors, .load() raises)
-        data, errors = self.schema.load(
-            data,
-            context={"identity": identity},
-        )
+        if validated:
+            # the loaded data may be shared with other events
+            data = copy.deepcopy(data)
+        else:
+            # Validate data (if there are errors, .load() raises)
+            data, errors = self.schema.load(
+                data,
+                context={"identity": identity},
+            )
 
         # It's the components that save the actual data in the record.
         record = self.record_cls.create(
             {},
             request=request.model,
-            request_id=str(request_id),
+            request_id=str(request.id),
             type=data["type"],
         )
 
@@ -63,16 +166,75 @@ class RequestEventsService(RecordService):
             uow=uow,
         )
 
-        # Persist record (DB and index)
-        uow.register(RecordCommitOp(record, indexer=self.indexer))
+        return record
 
-        return self.result_item(
-            self,
-            identity,
-            record,
-            links_tpl=self.links_item_tpl,
+    def _build_events(self, identity, request, events, uow=None):
+        """Validate the input data of many events and build the events.
+
+        The permissions are not checked, which is left to the caller.
+
+        :param events: List of ``(data, created_by, created)`` tuples, where
+                       ``created`` may be ``None`` (i.e. now).
+        :returns: The events, which haven't been added to the DB session yet
+                  (cf. ``RecordBulkInsertOp``).
+        """
+        # validate all events before building any (if there are errors,
+        # .load() raises, with the errors keyed by the index of the event)
+        loaded, _ = self.schema.load(
+            [data for data, _, _ in events],
+            schema_args={"many": True},
+            context={"identity": identity},
         )
 
+        records = []
+        for data, (_, created_by, created) in zip(loaded, events):
+            record = self.record_cls.build(
+                {},
+                request=request.model,
+                request_id=str(request.id),
+                type=data["type"],
+            )
+            if created is not None:
+                record.model.created = created
+
+            self.run_components(
+                "create",
+                identity=identity,
+                record=record,
+                request=request,
+                data=data,
+                created_by=created_by,
+                uow=uow,
+            )
+            records.append(record)
+
+        return records
+
+    def _persist_events(self, identity, request, records, uow=None):
+        """Register the built events for persistence and create the results."""
+        if not records:
+            return []
+
+        # insert all events with a single flush, and index them in bulk
+        uow.register(RecordBulkInsertOp(records, indexer=self.indexer))
+        uow.register(TimelinePublishOp(records, "created"))
+
+        # imported events keep their creation time, the others happen now
+        now = datetime.utcnow()
+        timestamp = max(record.model.created or now for record in records)
+        self._record_activity(request, records, uow=uow, timestamp=timestamp)
+
+        return [
+            self.result_item(
+                self,
+                identity,
+                record,
+                links_tpl=self.links_item_tpl,
+                request=request,
+            )
+            for record in records
+        ]
+
     def read(self, identity, id_):
         """Retrieve a record."""
         record = self._get_event(id_)
@@ -86,6 +248,40 @@ class RequestEventsService(RecordService):
             identity,
             record,
             links_tpl=self.links_item_tpl,
+            request=request,
+        )
+
+    def read_etag(self, identity, id_):
+        """Get the entity tag of the current revision of an event.
+
+        The tag also covers the revision of the request, on which the
+        permissions for the event depend.
+        Only the IDs and versions of the event and its request are queried:
+        neither are the records loaded, nor are the permissions checked
+        (cf. :mod:`invenio_requests.services.etags`).
+
+        :returns: The entity tag, or ``None`` if the event doesn't exist.
+        """
+        event_model = self.record_cls.model_cls
+        request_model = self.request_cls.model_cls
+        row = (
+            db.session.query(
+                event_model.id,
+                event_model.version_id,
+                request_model.id,
+                request_model.version_id,
+            )
+            .join(request_model, event_model.request_id == request_model.id)
+            .filter(event_model.id == id_)
+            .one_or_none()
+        )
+        if row is None:
+            return None
+
+        event_id, event_version_id, request_id, request_version_id = row
+        return make_etag(
+            identity,
+            [(event_id, event_version_id - 1), (request_id, request_version_id - 1)],
         )
 
     @unit_of_work()
@@ -119,6 +315,7 @@ class RequestEventsService(RecordService):
         )
 
         uow.register(RecordCommitOp(record, indexer=self.indexer))
+        uow.register(TimelinePublishOp([record], "updated"))
 
         return self.result_item(
             self,
@@ -148,31 +345,89 @@ class RequestEventsService(RecordService):
         permission = self._get_permission("delete", record.type)
         self.require_permission(identity, permission, request=request, event=record)
 
+        # timelines read from the database see the change right away
+        index_refresh = "none" if self.config.timeline_from_db else None
         if record.type == RequestEventType.COMMENT.value:
             record["payload"]["content"] = ""
             record.type = RequestEventType.REMOVED.value
             uow.register(
-                RecordCommitOp(record, indexer=self.indexer, index_refresh=True)
+                RecordCommitOp(
+                    record, indexer=self.indexer, index_refresh=index_refresh
+                )
             )
+            # the event stays in the timeline, but isn't a comment anymore
+            request.record_activity(comments=-1)
         else:
             uow.register(
                 RecordDeleteOp(
-                    record, force=True, indexer=self.indexer, index_refresh=True
+                    record,
+                    force=True,
+                    indexer=self.indexer,
+                    index_refresh=index_refresh,
                 )
             )
+            request.record_activity(events=-1)
+        uow.register(TimelinePublishOp([record], "deleted"))
+        uow.register(RecordIndexOp(request, indexer=current_requests_service.indexer))
 
         # Even though we don't always completely remove the RequestEvent
         # we return as though we did.
         return True
 
     def search(self, identity, request_id, params=None, es_preference=None, **kwargs):
-        """Search for events (optionally of request_id) matching the querystring."""
+        """Search for events (optionally of request_id) matching the querystring.
+
+        Without ``request_id``, the events of all requests are searched, and
+        only those of the requests the identity is involved in are found (via
+        the fields of the requests, which are indexed with their events).
+
+        For incremental fetches of the timeline, the ``since`` (timestamp) and
+        ``after_id`` (event ID) parameters limit the results to the events
+        created or updated after that point, oldest changes first.
+
+        If ``REQUESTS_TIMELINE_FROM_DB`` is enabled, the timeline of a request
+        is read from the database instead, unless the parameters need the
+        search (cf. :mod:`invenio_requests.services.events.timeline`).
+        """
         params = params or {}
         params.setdefault("sort", "oldest")
 
         # Permissions
-        request = self._get_request(request_id) if request_id else None
-        self.require_permission(identity, "search_event", request=request)
+        if request_id:
+            request = self._get_request(request_id)
+            self.require_permission(identity, "search_event", request=request)
+            permission_action = "read_event"
+        else:
+            # the events are filtered via the fields of their indexed requests
+            request = None
+            self.require_permission(identity, "search_all_events")
+            permission_action = "read_all_events"
+
+        links_tpl = LinksTemplate(
+            self.config.links_search,
+            context={"request_id": request_id, "args": params},
+        )
+
+        if request is not None and self.config.timeline_from_db:
+            params.update(kwargs)
+            if supports_params(params):
+                options = self.config.search.pagination_options
+                params.setdefault("size", options["default_results_per_page"])
+                params.setdefault("page", 1)
+                page = read_timeline(
+                    self.record_cls,
+                    request.id,
+                    params,
+                    options["default_max_results"],
+                )
+                return self.result_list(
+                    self,
+                    identity,
+                    page,
+                    params,
+                    links_tpl=links_tpl,
+                    links_item_tpl=self.links_item_tpl,
+                )
 
         # Prepare and execute the search
         search = self._search(
@@ -180,11 +435,15 @@ class RequestEventsService(RecordService):
             identity,
             params,
             es_preference,
-            permission_action="read_event",
+            permission_action=permission_action,
             **kwargs,
         )
-        if request_id:
-            search = search.filter("term", request_id=str(request_id))
+        if request is not None:
+            # the request may have been referenced by its number
+            search = search.filter("term", request_id=str(request.id))
+            routing = events_routing([request.id])
+            if routing is not None:
+                search = search.params(routing=routing)
         search_result = search.execute()
 
         return self.result_list(
@@ -192,14 +451,131 @@ class RequestEventsService(RecordService):
             identity,
             search_result,
             params,
-            links_tpl=LinksTemplate(
-                self.config.links_search,
-                context={"request_id": request_id, "args": params},
-            ),
+            links_tpl=links_tpl,
             links_item_tpl=self.links_item_tpl,
         )
 
+    def _iter_event_ids(self, batch_size):
+        """Iterate over the IDs of all events in chunks, skipping deleted ones.
+
+        The rows are paginated via their IDs (keyset pagination) rather than
+        with offsets, and only the IDs are loaded.
+        """
+        model_cls = self.record_cls.model_cls
+        query = (
+            db.session.query(model_cls.id)
+            .filter(model_cls.json.isnot(None))
+            .order_by(model_cls.id)
+        )
+
+        last_id = None
+        while True:
+            chunk_query = query
+            if last_id is not None:
+                chunk_query = chunk_query.filter(model_cls.id > last_id)
+
+            chunk = [row.id for row in chunk_query.limit(batch_size)]
+            if not chunk:
+                break
+
+            yield chunk
+            last_id = chunk[-1]
+
+    def rebuild_index(
+        self, identity, batch_size=500, progress_callback=None, recreate=False
+    ):
+        """Reindex all events managed by this service.
+
+        The events are streamed from the database in chunks of ``batch_size``
+        and each chunk is sent to Elasticsearch with a single bulk request
+        (routed by request, if ``REQUESTS_EVENTS_ROUTING`` is enabled).
+
+        :param batch_size: The number of events per chunk.
+        :param progress_callback: Optional callable, which is called with the
+                                  total number of indexed events so far
+                                  after each chunk.
+        :param recreate: Delete and recreate the events index first, e.g.
+                         after changing ``REQUESTS_EVENTS_ROUTING``.
+        :returns: The number of indexed events.
+        """
+        if recreate:
+            self.indexer.recreate_index()
+
+        indexed = 0
+        for event_ids in self._iter_event_ids(batch_size):
+            records = self.record_cls.get_records(event_ids)
+            indexed += index_records(self.indexer, records)
+            if progress_callback is not None:
+                progress_callback(indexed)
+
+        return indexed
+
+    def stream(self, identity, request_id, timeout=60, keepalive=15):
+        """Stream the changes of the request's timeline as they are committed.
+
+        The permission is checked and the subscription is made right away,
+        the changes are then yielded by the returned iterator: one
+        ``(change, data)`` tuple per changed event, where ``data`` is the
+        serialized event (or only its ``id``, if it can't be read anymore).
+        ``None`` is yielded after ``keepalive`` seconds without changes, and
+        the stream ends after ``timeout`` seconds.
+        """
+        request = self._get_request(request_id)
+        self.require_permission(identity, "search_event", request=request)
+
+        subscription = current_requests.timeline_broker.subscribe(str(request.id))
+        return self._stream(identity, subscription, timeout, keepalive)
+
+    def _stream(self, identity, subscription, timeout, keepalive):
+        """Iterate over the changes received via the subscription."""
+        deadline = time.monotonic() + timeout
+        with subscription:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+
+                message = subscription.get(timeout=min(keepalive, remaining))
+                if message is None:
+                    yield None
+                    continue
+
+                # start a new transaction, to see the changes committed by others
+                db.session.rollback()
+                event_id = message["event_id"]
+                try:
+                    data = self.read(identity, event_id).to_dict()
+                except (NoResultFound, PermissionDeniedError):
+                    data = {"id": event_id}
+
+                yield message["change"], data
+
     # Utilities
+    def _record_activity(self, request, events, uow=None, timestamp=None):
+        """Update the request's activity counters for the created events.
+
+        If a unit of work is given, the request is also reindexed. Otherwise,
+        the caller has to commit (and thereby reindex) the request afterwards,
+        i.e. this has to be called before registering the commit operation.
+
+        :param timestamp: Time of the activity (default: now).
+        """
+        if not events:
+            return
+
+        comment_type = RequestEventType.COMMENT.value
+        request.record_activity(
+            events=len(events),
+            comments=sum(1 for event in events if event.type == comment_type),
+            timestamp=timestamp or datetime.utcnow(),
+            # the commit of the request increments its version
+            increment_version=uow is not None,
+        )
+        if uow is not None:
+            uow.register(
+                RecordIndexOp(request, indexer=current_requests_service.indexer)
+            )
+
     @property
     def request_cls(self):
         """Get associated request class."""
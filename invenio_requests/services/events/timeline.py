@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2022 CERN.
+#
+# Invenio-Requests is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Reading the timeline of a single request from the database.
+
+A timeline is always scoped to one request, so it can be read with a range
+scan over the ``(request_id, created)`` index of the events table instead of
+a search.
+In contrast to the search index, the database reflects all changes made
+before (including the ones of the current transaction), without having to
+refresh the index.
+
+The pages are fetched with keyset pagination on ``(created, id)``: the cursor
+of a page holds the creation time and ID of its last event.
+"""
+
+from datetime import datetime
+
+from invenio_db import db
+from invenio_records_resources.pagination import Pagination
+from invenio_records_resources.services.errors import QuerystringValidationError
+from sqlalchemy import and_, or_
+
+from ...utils import is_uuid
+from ..search import decode_cursor, encode_cursor
+
+TIMELINE_SORT_OPTIONS = {
+    "oldest": False,
+    "newest": True,
+}
+"""Sort options supported by the database, mapped to ``descending``."""
+
+
+def supports_params(params):
+    """Check if the search parameters can be served from the database.
+
+    Queries, incremental fetches and other sort options need the search.
+    """
+    return (
+        not params.get("q")
+        and not params.get("since")
+        and not params.get("after_id")
+        and params.get("sort") in TIMELINE_SORT_OPTIONS
+    )
+
+
+class TimelinePage:
+    """One page of a request's timeline, read from the database."""
+
+    def __init__(self, records, total, next_cursor=None):
+        """Constructor.
+
+        :param records: The events of the page.
+        :param total: The total number of events in the timeline.
+        :param next_cursor: The cursor for the next page, if there is one.
+        """
+        self.records = records
+        self.total = total
+        self.next_cursor = next_cursor
+
+
+def _decode_timeline_cursor(cursor):
+    """Decode a cursor into the creation time and ID of an event."""
+    sort_values = decode_cursor(cursor)
+    try:
+        created, id_ = sort_values
+        created = datetime.fromisoformat(created)
+    except (TypeError, ValueError):
+        raise QuerystringValidationError("Invalid cursor.")
+
+    if not is_uuid(id_):
+        raise QuerystringValidationError("Invalid cursor.")
+    return created, id_
+
+
+def read_timeline(record_cls, request_id, params, max_results):
+    """Read one page of the request's timeline from the database.
+
+    :param record_cls: The event class.
+    :param request_id: The ID of the request.
+    :param params: The search parameters (``size``, ``page``, ``sort`` and
+                   ``cursor``), cf. :func:`supports_params`.
+    :param max_results: The maximum number of results reachable via pages.
+    :returns: A :class:`TimelinePage`.
+    """
+    size = params["size"]
+    page = params["page"]
+    if not Pagination(size, page, max_results).valid():
+        raise QuerystringValidationError("Invalid pagination parameters.")
+
+    model_cls = record_cls.model_cls
+    query = db.session.query(model_cls).filter(
+        model_cls.request_id == request_id,
+        model_cls.json.isnot(None),
+    )
+    total = query.count()
+
+    descending = TIMELINE_SORT_OPTIONS[params["sort"]]
+    cursor = params.get("cursor")
+    if cursor:
+        created, id_ = _decode_timeline_cursor(cursor)
+        if descending:
+            after = or_(
+                model_cls.created < created,
+                and_(model_cls.created == created, model_cls.id < id_),
+            )
+        else:
+            after = or_(
+                model_cls.created > created,
+                and_(model_cls.created == created, model_cls.id > id_),
+            )
+        query = query.filter(after)
+    elif page > 1:
+        query = query.offset((page - 1) * size)
+
+    if descending:
+        query = query.order_by(model_cls.created.desc(), model_cls.id.desc())
+    else:
+        query = query.order_by(model_cls.created.asc(), model_cls.id.asc())
+
+    models = query.limit(size).all()
+    records = [record_cls(model.data, model=model) for model in models]
+
+    next_cursor = None
+    if models and len(models) == size:
+        last = models[-1]
+        next_cursor = encode_cursor([last.created.isoformat(), str(last.id)])
+
+    return TimelinePage(records, total, next_cursor=next_cursor)
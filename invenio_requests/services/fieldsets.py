@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2022 CERN.
+#
+# Invenio-Requests is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Sparse fieldsets, i.e. limiting results to the fields asked for.
+
+Fields are given as a list or a comma-separated string of (top-level) keys of
+the serialized results, e.g. ``"id,number,status,title"``.
+Links can be selected individually with dots, e.g. ``"links.self"``
+(``"links"`` selects all links).
+"""
+
+
+def parse_fields(value):
+    """Parse the requested fields into a list (``None`` for all fields)."""
+    if not value:
+        return None
+
+    if isinstance(value, str):
+        value = value.split(",")
+
+    fields = []
+    for item in value:
+        fields.extend(f.strip() for f in str(item).split(",") if f.strip())
+    return fields or None
+
+
+def top_level_fields(fields):
+    """Get the set of top-level keys of the requested fields."""
+    return {field.split(".", 1)[0] for field in fields}
+
+
+def schema_only(fields, schema_cls):
+    """Get the requested top-level fields which are declared by the schema.
+
+    The result can be used as the ``only`` argument for the schema.
+    Nested fields are not projected further (i.e. ``"payload.content"``
+    selects the whole ``payload``).
+    """
+    declared = schema_cls._declared_fields
+    return tuple(
+        sorted(
+            field
+            for field in top_level_fields(fields)
+            if field in declared and field != "links"
+        )
+    )
+
+
+def requested_links(fields):
+    """Get the keys of the requested links.
+
+    :returns: ``None`` if all links are requested, otherwise the (possibly
+              empty) set of requested link keys.
+    """
+    if fields is None or "links" in fields:
+        return None
+
+    return {field[len("links."):] for field in fields if field.startswith("links.")}
+
+
+def source_includes(fields, required=()):
+    """Get the keys of the document source required for the fields."""
+    return sorted(top_level_fields(fields) - {"links"} | set(required))
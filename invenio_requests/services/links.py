@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2022 CERN.
+#
+# Invenio-Requests is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Precompiled links, for rendering many links without the URI template engine.
+
+Templates which only use simple (``{var}``) and reserved (``{+var}``)
+expansions of single variables are compiled into a format string once, when
+the link is defined (i.e. when the service config is built).
+Expanding the link then only percent-encodes the values and fills them into
+the format string.
+All other templates are expanded by the URI template engine, as before.
+
+Pagination links for searches are created with
+:func:`cursor_pagination_links`.
+
+If ``REQUESTS_LINKS_RELATIVE`` is enabled, the scheme and host are removed from
+the expanded links (e.g. ``https://example.org/api/requests/<id>`` becomes
+``/api/requests/<id>``).
+"""
+
+import re
+from urllib.parse import quote
+
+from flask import current_app
+from invenio_records_resources.services.base.links import Link
+
+_EXPRESSION = re.compile(r"{([^{}]*)}")
+_VARNAME = re.compile(r"^[A-Za-z0-9_]+$")
+_RESERVED = ":/?#[]@!$&'()*+,;="
+_ORIGIN = re.compile(r"^(?:[A-Za-z][A-Za-z0-9+.-]*:)?//[^/?#]*")
+
+
+def compile_template(uritemplate):
+    """Compile a URI template into a format string.
+
+    :returns: A tuple ``(format_string, variables)`` where ``variables`` is a
+              list of ``(name, reserved)`` tuples, or ``None`` if the template
+              uses expressions that can't be compiled.
+    """
+    parts = []
+    variables = []
+    pos = 0
+    for match in _EXPRESSION.finditer(uritemplate):
+        expression = match.group(1)
+        reserved = expression.startswith("+")
+        name = expression[1:] if reserved else expression
+        if not _VARNAME.match(name):
+            # operators, modifiers and lists of variables
+            return None
+
+        literal = uritemplate[pos:match.start()]
+        parts.append(literal.replace("{", "{{").replace("}", "}}"))
+        parts.append(f"{{{name}}}")
+        variables.append((name, reserved))
+        pos = match.end()
+
+    literal = uritemplate[pos:]
+    if "{" in literal or "}" in literal:
+        return None
+
+    parts.append(literal)
+    return "".join(parts), variables
+
+
+class CompiledLink(Link):
+    """Link whose URI template is compiled once, if possible."""
+
+    def __init__(self, uritemplate, when=None, vars=None):
+        """Constructor."""
+        super().__init__(uritemplate, when=when, vars=vars)
+        self._compiled = compile_template(uritemplate)
+
+    def expand(self, obj, context):
+        """Expand the link, using the compiled template if possible."""
+        if self._compiled is None:
+            return self._make_relative(super().expand(obj, context))
+
+        # the values are only read, so a shallow copy of the context is enough
+        vars = dict(context)
+        self.vars(obj, vars)
+        if self._vars_func:
+            self._vars_func(obj, vars)
+
+        fmt, variables = self._compiled
+        values = {}
+        for name, reserved in variables:
+            value = vars.get(name)
+            if isinstance(value, (list, tuple, dict)):
+                # composite values need the URI template engine
+                return self._make_relative(super().expand(obj, context))
+
+            value = "" if value is None else str(value)
+            values[name] = quote(value, safe=_RESERVED + "%" if reserved else "")
+
+        return self._make_relative(fmt.format(**values))
+
+    @staticmethod
+    def _make_relative(url):
+        """Remove the scheme and host from the URL, if configured."""
+        if current_app and current_app.config.get("REQUESTS_LINKS_RELATIVE"):
+            return _ORIGIN.sub("", url, count=1) or "/"
+
+        return url
+
+
+def _set_next_cursor(pagination, vars):
+    """Point the arguments to the page after the current one."""
+    vars["args"].pop("page", None)
+    vars["args"]["cursor"] = pagination.next_cursor
+
+
+def cursor_pagination_links(tpl):
+    """Create pagination links (prev/self/next) from the same template.
+
+    In contrast to ``pagination_links()``, the ``next`` link uses the cursor
+    of the results instead of the page number, so that following it costs the
+    same at any depth.
+    """
+    return {
+        "prev": Link(
+            tpl,
+            # pages can't be combined with cursors
+            when=lambda pagination, ctx: (
+                pagination.has_prev and not ctx["args"].get("cursor")
+            ),
+            vars=lambda pagination, vars: vars["args"].update(
+                {"page": pagination.prev_page.page}
+            ),
+        ),
+        "self": Link(tpl),
+        "next": Link(
+            tpl,
+            when=lambda pagination, ctx: pagination.next_cursor is not None,
+            vars=_set_next_cursor,
+        ),
+    }
@@ -169,6 +169,51 @@ class Commenter(Generator):
             return Q("terms", **{"created_by.user": users})
 
 
+class EventRequestCreator(Creator):
+    """Allows the makers of an event's request.
+
+    In searches, the events are filtered via the fields of their requests,
+    which are indexed with the events.
+    """
+
+    def query_filter(self, identity=None, **kwargs):
+        """Filters for events of requests made by the current identity."""
+        if self.disable_query:
+            return []
+
+        if identity:
+            user_id = _get_id(identity)
+            return Q("term", **{"parent.created_by.user": user_id})
+        else:
+            return []
+
+
+class EventRequestReceiver(Receiver):
+    """Allows the receivers of an event's request, unless it's a draft.
+
+    In searches, the events are filtered via the fields of their requests,
+    which are indexed with the events.
+    """
+
+    def __init__(self, disable_query=False):
+        """Constructor."""
+        super().__init__(check=is_no_draft, disable_query=disable_query)
+
+    def query_filter(self, identity=None, **kwargs):
+        """Filters for events of (non-draft) requests received by the identity."""
+        if self.disable_query:
+            return []
+
+        if identity:
+            user_id = _get_id(identity)
+            return Q("term", **{"parent.receiver.user": user_id}) & (
+                Q("term", **{"parent.is_open": True})
+                | Q("term", **{"parent.is_closed": True})
+            )
+        else:
+            return []
+
+
 class AllowedSearcher(Generator):
     """Any user that was allowed by the corresponding can_search.
 
@@ -223,4 +268,15 @@ class PermissionPolicy(RecordPermissionPolicy):
     ]
     can_update_event = [SystemProcess()]
     can_delete_event = [SystemProcess()]
+    # e.g. for migrating discussions, with their original creators and times
+    can_import_event = [SystemProcess()]
     can_search_event = [Creator(), Receiver(check=is_no_draft), SystemProcess()]
+
+    # Request Events: Search over the events of all requests
+    can_search_all_events = [AuthenticatedUser(), SystemProcess()]
+    # the events found are filtered via the fields of their requests
+    can_read_all_events = [
+        EventRequestCreator(),
+        EventRequestReceiver(),
+        SystemProcess(),
+    ]
@@ -12,7 +12,7 @@
 from .components import RequestNumberComponent
 from .config import RequestsServiceConfig
 from .links import RequestLink
-from .results import RequestItem, RequestList
+from .results import RequestItem, RequestList, RequestRecordList
 from .service import RequestsService
 
 __all__ = (
@@ -20,6 +20,7 @@ __all__ = (
     "RequestLink",
     "RequestItem",
     "RequestList",
+    "RequestRecordList",
     "RequestsService",
     "RequestsServiceConfig",
 )
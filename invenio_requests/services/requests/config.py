@@ -10,14 +10,15 @@
 
 """Requests service configuration."""
 
+from flask_babelex import lazy_gettext as _
 from invenio_records_resources.services import RecordServiceConfig, SearchOptions
-from invenio_records_resources.services.records.links import pagination_links
 
 from invenio_requests.services.requests import facets
 
 from ...customizations.base import RequestActions
 from ...records.api import Request
 from ..configurator import ConfiguratorMixin, FromConfig
+from ..links import cursor_pagination_links
 from ..permissions import PermissionPolicy
 from .components import (
     DefaultStatusComponent,
@@ -26,8 +27,8 @@ from .components import (
     RequestNumberComponent,
 )
 from .links import RequestLink
-from .params import IsOpenParam, ReferenceFilterParam
-from .results import RequestItem, RequestList
+from .params import CursorParam, IsOpenParam, ReferenceFilterParam, SourceFieldsParam
+from .results import RequestItem, RequestList, RequestRecordList
 
 
 def _is_action_available(request, context):
@@ -45,6 +46,17 @@ class RequestSearchOptions(SearchOptions):
         ReferenceFilterParam.factory(param="receiver", field="receiver"),
         ReferenceFilterParam.factory(param="topic", field="topic"),
         IsOpenParam.factory("is_open"),
+        SourceFieldsParam.factory(
+            # needed for loading the requests from the hits
+            required_fields=[
+                "$schema", "id", "uuid", "version_id", "created", "updated",
+                "type", "status", "number", "expires_at", "events_count",
+                "comments_count", "last_activity_at",
+            ],
+            # needed for checking the permissions of the action links
+            links_fields=["created_by", "receiver", "topic"],
+        ),
+        CursorParam,
     ]
 
     facets = {
@@ -52,6 +64,14 @@ class RequestSearchOptions(SearchOptions):
         'status': facets.status,
     }
 
+    sort_options = {
+        **SearchOptions.sort_options,
+        "recent_activity": dict(
+            title=_("Recent activity"),
+            fields=["-last_activity_at", "-created"],
+        ),
+    }
+
 
 class RequestsServiceConfig(RecordServiceConfig, ConfiguratorMixin):
     """Requests service configuration."""
@@ -62,6 +82,7 @@ class RequestsServiceConfig(RecordServiceConfig, ConfiguratorMixin):
     )
     result_item_cls = RequestItem
     result_list_cls = RequestList
+    result_record_list_cls = RequestRecordList
     search = RequestSearchOptions
 
     # request-specific configuration
@@ -75,7 +96,7 @@ class RequestsServiceConfig(RecordServiceConfig, ConfiguratorMixin):
         "comments": RequestLink("{+api}/requests/{id}/comments"),
         "timeline": RequestLink("{+api}/requests/{id}/timeline"),
     }
-    links_search = pagination_links("{+api}/requests{?args*}")
+    links_search = cursor_pagination_links("{+api}/requests{?args*}")
     action_link = RequestLink(
         "{+api}/requests/{id}/actions/{action}", when=_is_action_available
     )
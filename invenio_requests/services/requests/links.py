@@ -8,7 +8,9 @@
 
 """Utility for rendering URI template links."""
 
-from invenio_records_resources.services.base.links import Link, LinksTemplate
+from invenio_records_resources.services.base.links import LinksTemplate
+
+from ..links import CompiledLink
 
 
 class RequestLinksTemplate(LinksTemplate):
@@ -19,29 +21,38 @@ class RequestLinksTemplate(LinksTemplate):
         super().__init__(links, context=context)
         self._action_link = action_link
 
-    def expand(self, req, identity=None):
-        """Expand all the link templates."""
+    def expand(self, req, identity=None, keys=None):
+        """Expand all the link templates.
+
+        :param keys: Optional set of the link keys to expand (``"actions"``
+                     for the action links), e.g. for sparse fieldsets.
+        """
         links = {}
+        # the context is built only once per request, not once per link
+        context = self.context
 
         # expand links for all available actions on the request
-        links["actions"] = {}
-        link = self._action_link
-        for action in req.type.available_actions:
-            ctx = self.context.copy()
-            ctx["action"] = action
-            ctx["identity"] = identity
-            if link.should_render(req, ctx):
-                links["actions"][action] = link.expand(req, ctx)
+        # (the availability of most actions is precomputed, see RequestActions)
+        if keys is None or "actions" in keys:
+            links["actions"] = {}
+            link = self._action_link
+            ctx = dict(context, identity=identity)
+            for action in req.type.available_actions:
+                ctx["action"] = action
+                if link.should_render(req, ctx):
+                    links["actions"][action] = link.expand(req, ctx)
 
         # expand the other configured links
         for key, link in self._links.items():
-            if link.should_render(req, self.context):
-                links[key] = link.expand(req, self.context)
+            if keys is not None and key not in keys:
+                continue
+            if link.should_render(req, context):
+                links[key] = link.expand(req, context)
 
         return links
 
 
-class RequestLink(Link):
+class RequestLink(CompiledLink):
     """Shortcut for writing request links."""
 
     @staticmethod
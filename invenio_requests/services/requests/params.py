@@ -15,6 +15,8 @@ from invenio_records_resources.services.records.params import (
 )
 
 from ...resolvers.registry import ResolverRegistry
+from ..fieldsets import parse_fields, requested_links, source_includes
+from ..search import decode_cursor, with_tiebreaker
 
 
 class ReferenceFilterParam(FilterParam):
@@ -79,3 +81,53 @@ class IsOpenParam(ParamInterpreter):
         elif params.get("is_open") is False:
             search = search.filter('term', **{self.field_name: False})
         return search
+
+
+class SourceFieldsParam(ParamInterpreter):
+    """Limits the retrieved document source to the 'fields' parameter."""
+
+    def __init__(self, required_fields, links_fields, config):
+        """Construct.
+
+        :param required_fields: Keys which are always needed to load the hits.
+        :param links_fields: Additional keys needed for expanding the links.
+        """
+        self.required_fields = required_fields
+        self.links_fields = links_fields
+        super().__init__(config)
+
+    @classmethod
+    def factory(cls, required_fields, links_fields=()):
+        """Create a new source fields parameter."""
+        return partial(cls, required_fields, links_fields)
+
+    def apply(self, identity, search, params):
+        """Evaluate the fields parameter on the search."""
+        fields = parse_fields(params.get("fields"))
+        if not fields:
+            return search
+
+        required = list(self.required_fields)
+        if requested_links(fields) != set():
+            required.extend(self.links_fields)
+
+        return search.source(includes=source_includes(fields, required))
+
+
+class CursorParam(ParamInterpreter):
+    """Evaluates the 'cursor' parameter, for pagination with ``search_after``.
+
+    The hits are always sorted with a tie-breaker, so that their sort values
+    can be used as cursor for the next page.
+    """
+
+    def apply(self, identity, search, params):
+        """Evaluate the cursor parameter on the search."""
+        search = with_tiebreaker(search)
+
+        cursor = params.get("cursor")
+        if not cursor:
+            return search
+
+        # the cursor replaces the offset of the page
+        return search.extra(from_=0, search_after=decode_cursor(cursor))
@@ -12,6 +12,33 @@
 
 from invenio_records_resources.services.records.results import RecordItem, RecordList
 
+from ..etags import make_etag
+from ..fieldsets import parse_fields, requested_links, schema_only
+from ..search import CursorPagination, next_cursor
+
+
+def _dump_request(request, schema, identity, links_tpl=None, fields=None):
+    """Dump the request, optionally limited to the requested fields."""
+    schema_args = None
+    link_keys = None
+    if fields is not None:
+        schema_args = {"only": schema_only(fields, schema.schema)}
+        link_keys = requested_links(fields)
+
+    data = schema.dump(
+        request,
+        schema_args=schema_args,
+        context={
+            "identity": identity,
+            "record": request,
+        },
+    )
+
+    if links_tpl and link_keys != set():
+        data["links"] = links_tpl.expand(request, identity=identity, keys=link_keys)
+
+    return data
+
 
 class RequestItem(RecordItem):
     """Single request result."""
@@ -24,6 +51,7 @@ class RequestItem(RecordItem):
         errors=None,
         links_tpl=None,
         schema=None,
+        fields=None,
     ):
         """Constructor."""
         self._data = None
@@ -33,12 +61,22 @@ class RequestItem(RecordItem):
         self._service = service
         self._links_tpl = links_tpl
         self._schema = schema or service._wrap_schema(request.type.marshmallow_schema())
+        self._fields = parse_fields(fields)
 
     @property
     def id(self):
         """Identity of the request."""
         return str(self._request.id)
 
+    @property
+    def etag(self):
+        """Entity tag for this revision of the request, as seen by the identity."""
+        return make_etag(
+            self._identity,
+            [(self._request.id, self._request.revision_id)],
+            variant=self._fields,
+        )
+
     def __getitem__(self, key):
         """Key a key from the data."""
         return self.data[key]
@@ -59,17 +97,13 @@ class RequestItem(RecordItem):
         if self._data:
             return self._data
 
-        self._data = self._schema.dump(
+        self._data = _dump_request(
             self._obj,
-            context={
-                "identity": self._identity,
-                "record": self._request,
-            },
+            self._schema,
+            self._identity,
+            links_tpl=self._links_tpl,
+            fields=self._fields,
         )
-
-        if self._links_tpl:
-            self._data["links"] = self.links
-
         return self._data
 
     @property
@@ -112,30 +146,50 @@ class RequestList(RecordList):
         self._links_item_tpl = links_item_tpl
 
     @property
-    def hits(self):
-        """Iterator over the hits."""
+    def _fields(self):
+        """The requested fields (sparse fieldset), if any."""
+        return parse_fields(self._params.get("fields")) if self._params else None
+
+    def _iter_requests(self):
+        """Iterator over the requests loaded from the search results."""
         request_cls = self._service.record_cls
 
         for hit in self._results:
             # load dump
-            request = request_cls.loads(hit.to_dict())
+            yield request_cls.loads(hit.to_dict())
+
+    @property
+    def hits(self):
+        """Iterator over the hits."""
+        fields = self._fields
+
+        for request in self._iter_requests():
+            # the schema wrappers are cached per request type by the service
             schema = self._service._wrap_schema(request.type.marshmallow_schema())
 
             # project the request
-            projection = schema.dump(
+            yield _dump_request(
                 request,
-                context={
-                    "identity": self._identity,
-                    "record": request,
-                },
+                schema,
+                self._identity,
+                links_tpl=self._links_item_tpl,
+                fields=fields,
             )
 
-            if self._links_item_tpl:
-                projection["links"] = self._links_item_tpl.expand(
-                    request, identity=self._identity
-                )
+    @property
+    def next_cursor(self):
+        """Cursor for fetching the next page via the ``cursor`` parameter."""
+        return next_cursor(self._results, self._params.get("size"))
 
-            yield projection
+    @property
+    def pagination(self):
+        """Create a pagination object."""
+        return CursorPagination(
+            self._params["size"],
+            self._params["page"],
+            self.total,
+            next_cursor=self.next_cursor,
+        )
 
     def to_dict(self):
         """Return result as a dictionary."""
@@ -156,3 +210,32 @@ class RequestList(RecordList):
                 res["links"] = self._links_tpl.expand(self.pagination)
 
         return res
+
+
+class RequestRecordList(RequestList):
+    """List of requests loaded from the database (e.g. via ``read_many()``)."""
+
+    def __init__(self, service, identity, requests, links_item_tpl=None, fields=None):
+        """Constructor.
+
+        :params service: a service instance
+        :params identity: an identity that performed the service request
+        :params requests: the list of requests
+        :params fields: the requested fields (sparse fieldset), if any
+        """
+        super().__init__(service, identity, requests, links_item_tpl=links_item_tpl)
+        self._requested_fields = parse_fields(fields)
+
+    @property
+    def _fields(self):
+        """The requested fields (sparse fieldset), if any."""
+        return self._requested_fields
+
+    @property
+    def total(self):
+        """Get total number of requests."""
+        return len(self._results)
+
+    def _iter_requests(self):
+        """Iterator over the requests."""
+        return iter(self._results)
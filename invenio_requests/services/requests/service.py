@@ -10,26 +10,54 @@
 
 """Requests service."""
 
+import inspect
 import re
-
-from invenio_records_resources.services import RecordService, ServiceSchemaWrapper
-from invenio_records_resources.services.uow import (
+from datetime import datetime
+from itertools import islice
+from weakref import WeakKeyDictionary
+
+from invenio_db import db
+from invenio_records_resources.services import RecordService
+from invenio_records_resources.services.errors import PermissionDeniedError
+from invenio_records_resources.services.uow import UnitOfWork, unit_of_work
+from sqlalchemy import or_, tuple_
+
+from ...customizations.base import RequestActions, RequestState, RequestType
+from ...errors import ActionError, CannotExecuteActionError
+from ...proxies import current_events_service, current_registry, current_requests
+from ...records.api import RequestEventType
+from ...records.dumpers import parent_fields
+from ...resolvers.registry import ResolverRegistry
+from ...utils import is_uuid
+from ..etags import make_etag
+from ..fieldsets import parse_fields
+from ..schemas import CachedSchemaWrapper
+from ..search import iter_search_after
+from ..uow import (
+    ParentSyncOp,
+    RecordBulkCommitOp,
     RecordCommitOp,
     RecordDeleteOp,
-    unit_of_work,
+    TimelinePublishOp,
+    index_records,
 )
-
-from ...customizations.base import RequestActions
-from ...errors import CannotExecuteActionError
-from ...proxies import current_events_service, current_registry
-from ...records.api import RequestEventType
-from ...resolvers.registry import ResolverRegistry
 from .links import RequestLinksTemplate
 
 
+def _uses_default_number_generator(request_type):
+    """Check if the request type uses the default request number generator."""
+    type_cls = request_type if inspect.isclass(request_type) else type(request_type)
+    return type_cls.generate_request_number is RequestType.generate_request_number
+
+
 class RequestsService(RecordService):
     """Requests service."""
 
+    def __init__(self, config):
+        """Constructor."""
+        super().__init__(config)
+        self._schema_wrappers = WeakKeyDictionary()
+
     def check_permission(self, identity, action_name, from_action=False, **kwargs):
         """Check a permission against the identity."""
         if from_action and "request" in kwargs:
@@ -58,18 +86,33 @@ class RequestsService(RecordService):
         return current_registry
 
     def _wrap_schema(self, schema):
-        """Wrap schema."""
-        return ServiceSchemaWrapper(self, schema)
+        """Wrap schema.
 
-    @unit_of_work()
-    def create(
-        self, identity, data, request_type, receiver, creator=None, topic=None, uow=None
+        The wrappers are cached per schema (i.e. per request type), and keep
+        their schema instances for dumping.
+        """
+        wrapper = self._schema_wrappers.get(schema)
+        if wrapper is None:
+            wrapper = CachedSchemaWrapper(self, schema)
+            self._schema_wrappers[schema] = wrapper
+        return wrapper
+
+    def _create_request(
+        self,
+        identity,
+        data,
+        request_type,
+        receiver,
+        creator=None,
+        topic=None,
+        schema=None,
+        sequence_value=None,
+        uow=None,
     ):
-        """Create a record."""
-        self.require_permission(identity, "create")
+        """Create a request and run the components, without persisting it.
 
-        # we're not using "self.schema" b/c the schema may differ per request type!
-        schema = self._wrap_schema(request_type.marshmallow_schema())
+        :returns: A tuple of the created request and the validation errors.
+        """
         data, errors = schema.load(
             data,
             context={"identity": identity},
@@ -82,6 +125,11 @@ class RequestsService(RecordService):
             type=request_type,
         )
 
+        if sequence_value is not None:
+            # a number from the pre-allocated batch is used, which makes the
+            # request number component a no-op
+            type(request).number.assign(request, sequence_value=sequence_value)
+
         creator = (
             ResolverRegistry.reference_entity(creator)
             if creator is not None
@@ -101,6 +149,28 @@ class RequestsService(RecordService):
             uow=uow,
         )
 
+        return request, errors
+
+    @unit_of_work()
+    def create(
+        self, identity, data, request_type, receiver, creator=None, topic=None, uow=None
+    ):
+        """Create a record."""
+        self.require_permission(identity, "create")
+
+        # we're not using "self.schema" b/c the schema may differ per request type!
+        schema = self._wrap_schema(request_type.marshmallow_schema())
+        request, errors = self._create_request(
+            identity,
+            data,
+            request_type,
+            receiver,
+            creator=creator,
+            topic=topic,
+            schema=schema,
+            uow=uow,
+        )
+
         # persist record (DB and index)
         uow.register(RecordCommitOp(request, indexer=self.indexer))
 
@@ -113,8 +183,89 @@ class RequestsService(RecordService):
             errors=errors,
         )
 
-    def read(self, identity, id_):
-        """Retrieve a request."""
+    @unit_of_work()
+    def create_many(self, identity, items, uow=None):
+        """Create many requests at once.
+
+        Each item is a dictionary with the keys ``data``, ``request_type`` and
+        ``receiver``, and optionally ``creator`` and ``topic`` (i.e. the
+        arguments of ``create()``).
+        In contrast to calling ``create()`` for each item, the permission is
+        checked only once, the schema is built only once per request type,
+        the request numbers are allocated together, and all requests are
+        committed within a single savepoint and indexed with a single bulk
+        request.
+
+        Request numbers are only pre-allocated for request types that use the
+        default ``generate_request_number()``; types that override it generate
+        their numbers one by one, as in ``create()``.
+        """
+        self.require_permission(identity, "create")
+
+        items = list(items)
+        for idx, item in enumerate(items):
+            missing = {"data", "request_type", "receiver"} - set(item)
+            if missing:
+                raise ValueError(
+                    f"Item {idx} is missing the key(s): {', '.join(sorted(missing))}"
+                )
+
+        if not items:
+            return []
+
+        # pre-allocate the request numbers in one go, where possible
+        uses_default_numbers = [
+            _uses_default_number_generator(item["request_type"]) for item in items
+        ]
+        allocator = current_requests.request_number_allocator
+        sequence_values = iter(allocator.next_many(sum(uses_default_numbers)))
+
+        schemas = {}
+        created = []
+        for item, default_number in zip(items, uses_default_numbers):
+            request_type = item["request_type"]
+            if request_type.type_id not in schemas:
+                schemas[request_type.type_id] = self._wrap_schema(
+                    request_type.marshmallow_schema()
+                )
+            schema = schemas[request_type.type_id]
+
+            request, errors = self._create_request(
+                identity,
+                item["data"],
+                request_type,
+                item["receiver"],
+                creator=item.get("creator"),
+                topic=item.get("topic"),
+                schema=schema,
+                sequence_value=next(sequence_values) if default_number else None,
+                uow=uow,
+            )
+            created.append((request, schema, errors))
+
+        # persist all records within a single savepoint, and index them in bulk
+        uow.register(
+            RecordBulkCommitOp([r for r, _, _ in created], indexer=self.indexer)
+        )
+
+        return [
+            self.result_item(
+                self,
+                identity,
+                request,
+                schema=schema,
+                links_tpl=self.links_item_tpl,
+                errors=errors,
+            )
+            for request, schema, errors in created
+        ]
+
+    def read(self, identity, id_, fields=None):
+        """Retrieve a request.
+
+        :param fields: Optional list (or comma-separated string) of the fields
+                       to include in the result, e.g. ``"id,number,status"``.
+        """
         # resolve and require permission
         request = self.record_cls.get_record(id_)
         self.require_permission(identity, "read", request=request)
@@ -130,6 +281,101 @@ class RequestsService(RecordService):
             request,
             schema=self._wrap_schema(request.type.marshmallow_schema()),
             links_tpl=self.links_item_tpl,
+            fields=fields,
+        )
+
+    def read_etag(self, identity, id_, fields=None):
+        """Get the entity tag of the current revision of a request.
+
+        Only the ID and version of the request are queried: neither is the
+        request loaded, nor are the permissions checked
+        (cf. :mod:`invenio_requests.services.etags`).
+
+        :returns: The entity tag, or ``None`` if the request doesn't exist.
+        """
+        model_cls = self.record_cls.model_cls
+        column = model_cls.id if is_uuid(id_) else model_cls.number
+        row = (
+            db.session.query(model_cls.id, model_cls.version_id)
+            .filter(column == str(id_), model_cls.is_deleted != True)  # noqa
+            .one_or_none()
+        )
+        if row is None:
+            return None
+
+        return make_etag(
+            identity, [(row.id, row.version_id - 1)], variant=parse_fields(fields)
+        )
+
+    def _get_records_by_ids_or_numbers(self, ids_or_numbers):
+        """Fetch the requests with the given IDs or numbers with one query.
+
+        Deleted requests are left out.
+
+        :returns: A dictionary mapping the IDs and numbers (as strings) of the
+                  found requests to the requests.
+        """
+        ids, numbers = [], []
+        for value in ids_or_numbers:
+            if is_uuid(value):
+                ids.append(str(value))
+            else:
+                numbers.append(str(value))
+
+        criteria = []
+        model_cls = self.record_cls.model_cls
+        if ids:
+            criteria.append(model_cls.id.in_(ids))
+        if numbers:
+            criteria.append(model_cls.number.in_(numbers))
+
+        found = {}
+        if criteria:
+            query = model_cls.query.filter(
+                or_(*criteria),
+                model_cls.is_deleted != True,  # noqa
+            )
+            for model in query:
+                request = self.record_cls(model.data, model=model)
+                found[str(model.id)] = request
+                if model.number is not None:
+                    found[model.number] = request
+        return found
+
+    def read_many(self, identity, ids_or_numbers, fields=None):
+        """Retrieve many requests by their IDs or (external) numbers.
+
+        All requests are fetched from the database with a single query.
+        As for searches, requests that don't exist or that the identity is not
+        allowed to read are left out of the result.
+        The remaining requests are returned in the order of the given values.
+        """
+        found = self._get_records_by_ids_or_numbers(ids_or_numbers)
+
+        requests = []
+        seen = set()
+        for value in ids_or_numbers:
+            request = found.get(str(value))
+            if request is None or request.id in seen:
+                continue
+            seen.add(request.id)
+
+            if not self.check_permission(identity, "read", request=request):
+                continue
+
+            # run components
+            for component in self.components:
+                if hasattr(component, "read"):
+                    component.read(identity, record=request)
+
+            requests.append(request)
+
+        return self.config.result_record_list_cls(
+            self,
+            identity,
+            requests,
+            links_item_tpl=self.links_item_tpl,
+            fields=fields,
         )
 
     @unit_of_work()
@@ -152,9 +398,11 @@ class RequestsService(RecordService):
         )
 
         # run components
+        parent = parent_fields(request)
         self.run_components("update", identity, data=data, record=request, uow=uow)
 
         uow.register(RecordCommitOp(request, indexer=self.indexer))
+        self._sync_events([request], [parent], uow)
 
         return self.result_item(
             self,
@@ -184,28 +432,214 @@ class RequestsService(RecordService):
         uow.register(RecordDeleteOp(request, indexer=self.indexer))
         return True
 
-    def reindex(self, identity, params=None, es_preference=None, **kwargs):
-        """Reindex records matching the query parameters."""
-        # TODO check later
-        return super().reindex(identity, params=None, es_preference=None, **kwargs)
+    def export(
+        self,
+        identity,
+        params=None,
+        es_preference=None,
+        batch_size=1000,
+        keep_alive="1m",
+        **kwargs,
+    ):
+        """Iterate over all requests matching the search parameters.
 
-    def rebuild_index(self, identity):
-        """Reindex all records managed by this service."""
-        for req_meta in self.record_cls.model_cls.query.all():
-            request = self._request_from_model(req_meta)
+        The parameters are the same as for ``search()``, except for the
+        pagination which is ignored.
+        The hits are fetched from Elasticsearch in batches of ``batch_size``
+        via ``search_after`` (with a point in time, if supported), and are
+        serialized like the hits of a search.
+        Only one batch is kept in memory at any time, so this is suitable for
+        exporting arbitrarily many requests.
 
-            if not request.is_deleted:
-                self.indexer.index(request)
+        :returns: A result list, whose ``hits`` are evaluated lazily.
+        """
+        self.require_permission(identity, "search")
 
-    @unit_of_work()
-    def execute_action(self, identity, id_, action, data=None, uow=None):
-        """Execute the given action for the request, if possible.
+        params = params or {}
+        search = self._search("search", identity, params, es_preference, **kwargs)
+        hits = iter_search_after(search, batch_size, keep_alive=keep_alive)
 
-        For instance, it would be not possible to execute the specified
-        action on the request, if the latter has the wrong status.
+        return self.result_list(
+            self,
+            identity,
+            hits,
+            params,
+            links_tpl=None,
+            links_item_tpl=self.links_item_tpl,
+        )
+
+    def reindex(
+        self, identity, params=None, es_preference=None, batch_size=500, **kwargs
+    ):
+        """Reindex the requests matching the search parameters.
+
+        The parameters are the same as for ``search()`` (e.g. ``type`` and
+        ``status`` facets, ``receiver``, ``topic`` or ``is_open``).
+        The IDs of the matching requests are scanned from Elasticsearch, the
+        requests are loaded from the database in chunks of ``batch_size`` with
+        one query each (requests that have been deleted in the meantime are
+        skipped), and each chunk is reindexed with a single bulk request.
+
+        :returns: The number of reindexed requests.
+        """
+        self.require_permission(identity, "search")
+
+        params = params or {}
+        search = self._search("reindex", identity, params, es_preference, **kwargs)
+        hit_ids = (hit.meta.id for hit in search.source(False).scan())
+
+        indexed = 0
+        while True:
+            chunk = list(islice(hit_ids, batch_size))
+            if not chunk:
+                break
+
+            # deleted requests are skipped
+            records = self.record_cls.get_records(chunk)
+            indexed += index_records(self.indexer, records)
+
+        return indexed
+
+    def _iter_request_ids(self, batch_size):
+        """Iterate over the IDs of all requests in chunks, skipping deleted ones.
+
+        The rows are paginated via their IDs (keyset pagination) rather than
+        with offsets, and only the IDs are loaded.
+        """
+        model_cls = self.record_cls.model_cls
+        query = (
+            db.session.query(model_cls.id)
+            .filter(model_cls.is_deleted != True)  # noqa
+            .order_by(model_cls.id)
+        )
+
+        last_id = None
+        while True:
+            chunk_query = query
+            if last_id is not None:
+                chunk_query = chunk_query.filter(model_cls.id > last_id)
+
+            chunk = [row.id for row in chunk_query.limit(batch_size)]
+            if not chunk:
+                break
+
+            yield chunk
+            last_id = chunk[-1]
+
+    def rebuild_index(self, identity, batch_size=500, progress_callback=None):
+        """Reindex all records managed by this service.
+
+        The requests are streamed from the database in chunks of ``batch_size``
+        and each chunk is sent to Elasticsearch with a single bulk request.
+        Deleted requests are skipped.
+
+        :param batch_size: The number of requests per chunk.
+        :param progress_callback: Optional callable, which is called with the
+                                  total number of indexed requests so far
+                                  after each chunk.
+        :returns: The number of indexed requests.
+        """
+        indexed = 0
+        for request_ids in self._iter_request_ids(batch_size):
+            records = self.record_cls.get_records(request_ids)
+            indexed += index_records(self.indexer, records)
+            if progress_callback is not None:
+                progress_callback(indexed)
+
+        return indexed
+
+    def _iter_expired_request_ids(self, batch_size, now=None):
+        """Iterate over the IDs of open requests past their expiration date.
+
+        Only the requests in one of the "open" statuses of the registered
+        request types are considered, so that requests which have already
+        been closed are not visited over and over again.
+
+        The rows are paginated via ``(expires_at, id)`` (keyset pagination),
+        so that each chunk is a range scan over the index of ``expires_at``
+        rather than a walk over the primary key.
+        """
+        open_statuses = sorted(
+            {
+                status
+                for request_type in self.request_type_registry
+                for status, state in request_type.available_statuses.items()
+                if state == RequestState.OPEN
+            }
+        )
+        if not open_statuses:
+            return
+
+        model_cls = self.record_cls.model_cls
+        query = (
+            db.session.query(model_cls.id, model_cls.expires_at)
+            .filter(
+                model_cls.is_deleted != True,  # noqa
+                model_cls.expires_at < (now or datetime.utcnow()),
+                model_cls.json["status"].as_string().in_(open_statuses),
+            )
+            .order_by(model_cls.expires_at, model_cls.id)
+        )
+
+        last = None
+        while True:
+            chunk_query = query
+            if last is not None:
+                last_expires_at, last_id = last
+                chunk_query = chunk_query.filter(
+                    model_cls.expires_at >= last_expires_at,
+                    tuple_(model_cls.expires_at, model_cls.id)
+                    > tuple_(last_expires_at, last_id),
+                )
+
+            rows = chunk_query.limit(batch_size).all()
+            if not rows:
+                break
+
+            yield [row.id for row in rows]
+            last = (rows[-1].expires_at, rows[-1].id)
+
+    def expire_requests(self, identity, batch_size=500, now=None):
+        """Expire all open requests whose expiration date has passed.
+
+        The expired requests are looked up in chunks of ``batch_size`` and
+        the ``expire`` action is executed for each chunk via
+        ``execute_action_many()``, in its own unit of work: the status changes
+        and created events are committed and bulk-indexed per chunk.
+        Requests for which the action cannot be executed are skipped.
+
+        Note: the ``expire`` action can only be executed by system processes,
+        i.e. this would usually be called with the ``system_identity``.
+
+        :param batch_size: The number of requests per chunk.
+        :param now: The reference time for the expiration (defaults to now).
+        :returns: The number of expired requests.
+        """
+        expired = 0
+        for request_ids in self._iter_expired_request_ids(batch_size, now=now):
+            with UnitOfWork() as uow:
+                results = self.execute_action_many(
+                    identity, request_ids, "expire", uow=uow
+                )
+                uow.commit()
+
+            expired += sum(1 for result in results if result["success"])
+
+        return expired
+
+    def _execute_action(
+        self, identity, request, action, data=None, uow=None, validated=False
+    ):
+        """Execute the action on the request, if possible.
+
+        The request and the created events are not registered for persistence
+        in the unit of work, which is left to the caller.
+
+        :param validated: If the comment ``data`` has already been loaded with
+                          the schema of the events.
+
+        :returns: The list of created events.
         """
-        # Retrieve request and action
-        request = self.record_cls.get_record(id_)
         action_obj = RequestActions.get_action(request, action)
 
         # check permissions
@@ -218,23 +652,70 @@ class RequestsService(RecordService):
         # Create action event if defined
         # Because the action may change the request's status, this has to be done
         # before the action is executed
+        events = []
         event_type = action_obj.event_type
         if event_type is not None:
-            current_events_service.create(
-                identity, request.id, {"type": event_type}, uow=uow
+            events.append(
+                current_events_service._create_event(
+                    identity, request, {"type": event_type}, uow=uow
+                )
             )
 
-        # Execute action and register request for persistence.
+        # Execute action
         action_obj.execute(identity, uow)
-        uow.register(RecordCommitOp(request, indexer=self.indexer))
 
         # Assuming that data is just for comment payload
         if data:
             comment_type = RequestEventType.COMMENT.value
-            current_events_service.create(
-                identity, request.id, {**data, "type": comment_type}, uow=uow
+            events.append(
+                current_events_service._create_event(
+                    identity,
+                    request,
+                    {**data, "type": comment_type},
+                    uow=uow,
+                    validated=validated,
+                )
             )
 
+        return events
+
+    def _sync_events(self, requests, parents, uow):
+        """Update the indexed events of the requests whose fields changed.
+
+        :param requests: The (possibly) changed requests.
+        :param parents: The indexed fields of each request before the change
+                        (cf. :func:`~invenio_requests.records.dumpers.parent_fields`).
+        """
+        changed = [
+            request
+            for request, parent in zip(requests, parents)
+            if parent_fields(request) != parent
+        ]
+        if changed:
+            uow.register(ParentSyncOp(changed, current_events_service.indexer))
+
+    @unit_of_work()
+    def execute_action(self, identity, id_, action, data=None, uow=None):
+        """Execute the given action for the request, if possible.
+
+        For instance, it would be not possible to execute the specified
+        action on the request, if the latter has the wrong status.
+        """
+        # Retrieve request and execute the action
+        request = self.record_cls.get_record(id_)
+        parent = parent_fields(request)
+        events = self._execute_action(identity, request, action, data=data, uow=uow)
+
+        # the request is committed and reindexed by its commit operation
+        current_events_service._record_activity(request, events)
+
+        # Register request and events for persistence
+        uow.register(RecordCommitOp(request, indexer=self.indexer))
+        for event in events:
+            uow.register(RecordCommitOp(event, indexer=current_events_service.indexer))
+        uow.register(TimelinePublishOp(events, "created"))
+        self._sync_events([request], [parent], uow)
+
         return self.result_item(
             self,
             identity,
@@ -242,3 +723,86 @@ class RequestsService(RecordService):
             schema=self._wrap_schema(request.type.marshmallow_schema()),
             links_tpl=self.links_item_tpl,
         )
+
+    @unit_of_work()
+    def execute_action_many(self, identity, ids, action, data=None, uow=None):
+        """Execute the given action for many requests, where possible.
+
+        All requests are loaded with a single query, and the status changes and
+        created events are committed and indexed together (one bulk request
+        for the requests and one for the events).
+        The requests can be referenced by their IDs or numbers; values which
+        don't match any request are reported as not found.
+        The optional ``data`` is used as comment for each of the requests, and
+        validated only once.
+
+        Errors for single requests (e.g. missing permissions or a wrong
+        status) don't abort the whole operation, but are reported per request.
+        Note that operations registered by the actions themselves in the unit
+        of work (e.g. publishing a record) are not undone on such errors.
+
+        :returns: A list with one dictionary per ID, with the keys ``id``,
+                  ``success`` and either ``item`` (the result item of the
+                  request) or ``error`` (the error message).
+        """
+        ids = [str(id_) for id_ in ids]
+        requests = self._get_records_by_ids_or_numbers(ids)
+
+        if data:
+            # the comment is the same for all requests, so it's validated once
+            comment_type = RequestEventType.COMMENT.value
+            data, _ = current_events_service.schema.load(
+                {**data, "type": comment_type}, context={"identity": identity}
+            )
+
+        results = []
+        executed, events, executed_events, parents = [], [], [], []
+        schemas = {}
+        for id_ in ids:
+            request = requests.get(id_)
+            if request is None:
+                results.append(
+                    {"id": id_, "success": False, "error": "Request not found."}
+                )
+                continue
+
+            parent = parent_fields(request)
+            try:
+                # failed requests must not leave any created events behind
+                with db.session.begin_nested():
+                    request_events = self._execute_action(
+                        identity, request, action, data=data, uow=uow, validated=True
+                    )
+            except (ActionError, PermissionDeniedError) as e:
+                results.append({"id": id_, "success": False, "error": str(e)})
+                continue
+
+            executed.append(request)
+            parents.append(parent)
+            events.extend(request_events)
+            executed_events.append((request, request_events))
+
+            type_id = request.type.type_id
+            if type_id not in schemas:
+                schemas[type_id] = self._wrap_schema(request.type.marshmallow_schema())
+
+            item = self.result_item(
+                self,
+                identity,
+                request,
+                schema=schemas[type_id],
+                links_tpl=self.links_item_tpl,
+            )
+            results.append({"id": id_, "success": True, "item": item})
+
+        # the requests are committed and reindexed by their commit operation
+        for request, request_events in executed_events:
+            current_events_service._record_activity(request, request_events)
+
+        # persist and index the requests and events together
+        uow.register(RecordBulkCommitOp(executed, indexer=self.indexer))
+        uow.register(RecordBulkCommitOp(events, indexer=current_events_service.indexer))
+        uow.register(TimelinePublishOp(events, "created"))
+        self._sync_events(executed, parents, uow)
+
+        return results
@@ -9,10 +9,15 @@
 
 """Request Event Schemas."""
 
+import threading
 from datetime import timezone
 
-from invenio_records_resources.services.records.schema import BaseRecordSchema
+from invenio_records_resources.services.records.schema import (
+    BaseRecordSchema,
+    ServiceSchemaWrapper,
+)
 from marshmallow import RAISE, Schema, fields, missing, validate
+from marshmallow.decorators import POST_DUMP, PRE_DUMP
 from marshmallow_oneofschema import OneOfSchema
 from marshmallow_utils import fields as utils_fields
 
@@ -40,6 +45,11 @@ class RequestSchema(BaseRecordSchema):
         timezone=timezone.utc, format="iso", dump_only=True
     )
     is_expired = fields.Boolean(dump_only=True)
+    events_count = fields.Integer(dump_only=True)
+    comments_count = fields.Integer(dump_only=True)
+    last_activity_at = utils_fields.TZDateTime(
+        timezone=timezone.utc, format="iso", dump_only=True
+    )
 
     class Meta:
         """Schema meta."""
@@ -119,3 +129,95 @@ class RequestEventSchema(BaseRecordSchema, OneOfSchema):
     def get_obj_type(self, obj):
         """Return key of type_schemas to use given object to dump."""
         return obj.type
+
+
+#
+# Schema wrappers
+#
+class CachedSchemaWrapper(ServiceSchemaWrapper):
+    """Schema wrapper that reuses its schema instance for dumping.
+
+    Creating a marshmallow schema instance copies all of its fields, which
+    costs more than dumping a request itself.
+    Instead, this wrapper keeps one schema instance per thread and only
+    replaces its context for each dump.
+    Further, if the schema has no pre-/post-dump processors, the fields are
+    serialized directly from a precomputed list (i.e. what ``Schema.dump()``
+    does, without its processor and error handling).
+    """
+
+    max_cached_schemas = 32
+    """Maximum number of cached instances per thread (i.e. ``only`` values)."""
+
+    def __init__(self, service, schema):
+        """Constructor."""
+        super().__init__(service, schema)
+        self._local = threading.local()
+
+    def _get_dump_schema(self, context, only=None):
+        """Get the schema instance of this thread, with the given context."""
+        schemas = getattr(self._local, "schemas", None)
+        if schemas is None:
+            schemas = self._local.schemas = {}
+
+        if only not in schemas:
+            schema = self.schema(context=context, only=only)
+            if len(schemas) >= self.max_cached_schemas:
+                # don't keep instances for arbitrary combinations of fields
+                return schema, None
+
+            has_processors = schema._has_processors(
+                PRE_DUMP
+            ) or schema._has_processors(POST_DUMP)
+
+            dump_fields = None
+            if not has_processors:
+                dump_fields = [
+                    (
+                        field_obj.data_key if field_obj.data_key is not None
+                        else attr_name,
+                        attr_name,
+                        field_obj,
+                    )
+                    for attr_name, field_obj in schema.dump_fields.items()
+                ]
+            schemas[only] = (schema, dump_fields)
+        else:
+            # nested schemas share the context dictionary of their parent
+            schema = schemas[only][0]
+            schema.context.clear()
+            schema.context.update(context)
+
+        return schemas[only]
+
+    def dump(self, data, schema_args=None, context=None):
+        """Dump data using the cached schema instance.
+
+        Besides ``only`` (e.g. for sparse fieldsets), schema arguments are not
+        supported by the cached instances and will use a new instance.
+        """
+        schema_args = schema_args or {}
+        only = schema_args.get("only")
+        # other arguments require a dedicated instance, and so do nested dumps
+        if set(schema_args) - {"only"} or getattr(self._local, "dumping", False):
+            return super().dump(data, schema_args=schema_args, context=context)
+
+        context = self._build_context(context or {})
+        self._local.dumping = True
+        try:
+            schema, dump_fields = self._get_dump_schema(
+                context, only=tuple(only) if only is not None else None
+            )
+            if dump_fields is None:
+                return schema.dump(data)
+
+            result = schema.dict_class()
+            for key, attr_name, field_obj in dump_fields:
+                value = field_obj.serialize(
+                    attr_name, data, accessor=schema.get_attribute
+                )
+                if value is not missing:
+                    result[key] = value
+            return result
+        finally:
+            self._local.dumping = False
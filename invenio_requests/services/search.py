@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2022 CERN.
+#
+# Invenio-Requests is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Deep pagination of search results with ``search_after``.
+
+In contrast to ``from``/``size`` pagination, the cost of fetching the next
+batch of hits with ``search_after`` doesn't grow with the offset, and it isn't
+capped by the ``index.max_result_window`` setting.
+
+For iterating over all hits (e.g. exports), a point in time is opened if the
+cluster supports it, so that all batches are taken from the same view of the
+index.
+For paginated results, the sort values of the last hit are handed out to the
+client as an opaque cursor for fetching the next page.
+"""
+
+import base64
+import json
+
+from elasticsearch import TransportError
+from invenio_records_resources.pagination import Pagination
+from invenio_records_resources.services.errors import QuerystringValidationError
+
+TIEBREAKER_FIELD = "uuid"
+"""Unique field used for sorting hits with the same sort values."""
+
+
+def with_tiebreaker(search):
+    """Make the sort order of the search deterministic.
+
+    Hits with equal sort values are ordered by their ID, as required for
+    ``search_after``.
+    """
+    sort = search.to_dict().get("sort", [])
+    for field in sort:
+        name = next(iter(field)) if isinstance(field, dict) else field.lstrip("-")
+        if name == TIEBREAKER_FIELD:
+            return search
+
+    return search.sort(*sort, {TIEBREAKER_FIELD: "asc"})
+
+
+def encode_cursor(sort_values):
+    """Encode the sort values of a hit as an opaque cursor."""
+    data = json.dumps(list(sort_values), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Decode a cursor into the sort values for ``search_after``."""
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        sort_values = json.loads(base64.urlsafe_b64decode(cursor + padding))
+    except (TypeError, ValueError):
+        raise QuerystringValidationError("Invalid cursor.")
+
+    if not isinstance(sort_values, list) or not sort_values:
+        raise QuerystringValidationError("Invalid cursor.")
+
+    return sort_values
+
+
+def next_cursor(results, size):
+    """Get the cursor for the page after the given search results.
+
+    :returns: The cursor, or ``None`` if the page isn't full (i.e. it's the
+              last one) or the hits don't carry sort values.
+    """
+    hits = getattr(results, "hits", None)
+    if not hits or not size or len(hits) < size:
+        return None
+
+    sort_values = getattr(hits[-1].meta, "sort", None)
+    return encode_cursor(sort_values) if sort_values else None
+
+
+class CursorPagination(Pagination):
+    """Pagination which also knows the cursor for the next page."""
+
+    def __init__(self, size, page, max_results, next_cursor=None):
+        """Constructor."""
+        super().__init__(size, page, max_results)
+        self.next_cursor = next_cursor
+
+
+def _open_point_in_time(search, keep_alive):
+    """Open a point in time for the search's indices, if supported."""
+    client = search._get_connection()
+    if not hasattr(client, "open_point_in_time"):
+        return None
+
+    try:
+        index = ",".join(search._index or [])
+        return client.open_point_in_time(index=index, keep_alive=keep_alive)["id"]
+    except TransportError:
+        # e.g. clusters older than Elasticsearch 7.10
+        return None
+
+
+def _close_point_in_time(search, pit_id):
+    """Close the point in time, ignoring errors."""
+    try:
+        search._get_connection().close_point_in_time(body={"id": pit_id})
+    except TransportError:
+        pass
+
+
+def iter_search_after(search, batch_size, keep_alive="1m"):
+    """Iterate over all hits of the search, in batches of ``batch_size``.
+
+    Only one batch of hits is kept in memory at any time.
+    The pagination (``from``/``size``) set on the search is ignored.
+
+    :param search: The search (e.g. as created by the service).
+    :param batch_size: The number of hits to fetch per request.
+    :param keep_alive: How long to keep the point in time alive between batches.
+    """
+    search = with_tiebreaker(search).extra(
+        from_=0, size=batch_size, track_total_hits=False
+    )
+
+    pit_id = _open_point_in_time(search, keep_alive)
+    if pit_id is not None:
+        # searches with a point in time must not specify the indices
+        search = search.index()
+
+    try:
+        search_after = None
+        while True:
+            page = search
+            if search_after is not None:
+                page = page.extra(search_after=search_after)
+            if pit_id is not None:
+                page = page.extra(pit={"id": pit_id, "keep_alive": keep_alive})
+
+            result = page.execute()
+            # the ID of the point in time can change between requests
+            pit_id = getattr(result, "pit_id", None) or pit_id
+
+            hits = list(result)
+            yield from hits
+            if len(hits) < batch_size:
+                break
+
+            search_after = list(hits[-1].meta.sort)
+    finally:
+        if pit_id is not None:
+            _close_point_in_time(search, pit_id)
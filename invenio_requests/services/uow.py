@@ -0,0 +1,393 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2022 CERN.
+#
+# Invenio-Requests is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Unit of work operations for persisting and indexing many records at once.
+
+The operations from Invenio-Records-Resources handle a single record each,
+which means one commit operation and one Elasticsearch request per record.
+The operations in this module do the same work for a whole list of records,
+within a single savepoint and with a single bulk request to Elasticsearch.
+Further, changes of request events can be published to the subscribers of
+the timelines after the commit.
+
+.. code-block:: python
+
+    @unit_of_work()
+    def create_many(self, identity, items, uow=None):
+        # ...
+        uow.register(RecordBulkCommitOp(records, indexer=self.indexer))
+
+All operations with an indexer make the changes visible in the search
+according to the refresh strategy configured via ``REQUESTS_INDEX_REFRESH``
+(or the one given explicitly as ``index_refresh``):
+
+* ``"none"``: the changes become visible with the next periodic refresh.
+* ``"wait_for"``: the index requests wait until the changes are visible,
+  without forcing a refresh.
+* ``"coalesced"``: each index written to within the unit of work is refreshed
+  once, after all operations have been committed.
+* ``"immediate"``: each index request forces a refresh.
+
+This is why the services use the single-record operations of this module
+instead of the ones from Invenio-Records-Resources.
+"""
+
+from weakref import WeakKeyDictionary
+
+from elasticsearch.helpers import bulk
+from flask import current_app
+from invenio_db import db
+from invenio_records_resources.services.uow import Operation
+from invenio_records_resources.services.uow import RecordCommitOp as _RecordCommitOp
+from invenio_records_resources.services.uow import RecordDeleteOp as _RecordDeleteOp
+from invenio_search.utils import build_alias_name
+
+from ..proxies import current_requests
+from ..records.dumpers import parent_fields
+
+REFRESH_STRATEGIES = ("none", "wait_for", "coalesced", "immediate")
+"""The supported refresh strategies (cf. ``REQUESTS_INDEX_REFRESH``)."""
+
+
+def get_refresh_strategy(index_refresh=None):
+    """Get the refresh strategy to use.
+
+    :param index_refresh: The strategy, or ``None`` for the configured one.
+                          For compatibility with the operations of
+                          Invenio-Records-Resources, ``True`` and ``False``
+                          stand for ``"immediate"`` and ``"none"``.
+    """
+    if index_refresh is None:
+        index_refresh = current_app.config.get("REQUESTS_INDEX_REFRESH", "none")
+    if index_refresh is True:
+        return "immediate"
+    if index_refresh is False:
+        return "none"
+
+    if index_refresh not in REFRESH_STRATEGIES:
+        raise ValueError(f"Invalid refresh strategy: {index_refresh!r}")
+    return index_refresh
+
+
+def refresh_argument(strategy):
+    """Get the ``refresh`` argument of the index requests for the strategy."""
+    return {"wait_for": "wait_for", "immediate": True}.get(strategy, False)
+
+
+def _index_action(indexer, record):
+    """Build the bulk index action for an already loaded record.
+
+    This is what ``RecordIndexer._index_action()`` does, except for loading
+    the record from the database again.
+    """
+    index, doc_type = indexer.record_to_index(record)
+
+    arguments = {}
+    body = indexer._prepare_record(record, index, doc_type, arguments)
+    index, doc_type = indexer._prepare_index(index, doc_type)
+
+    action = {
+        "_op_type": "index",
+        "_index": index,
+        "_type": doc_type,
+        "_id": str(record.id),
+        "_version": record.revision_id,
+        "_version_type": indexer._version_type,
+        "_source": body,
+    }
+    action.update(arguments)
+    return action
+
+
+def index_records(indexer, records, refresh=False, **kwargs):
+    """Index the given records with bulk requests to Elasticsearch.
+
+    In contrast to ``RecordIndexer.bulk_index()``, this does not go through the
+    indexing queue but sends the bulk request right away.
+    The records are not loaded from the database again, so loading a chunk of
+    records to reindex (e.g. with ``get_records()``) takes a single query.
+
+    :param indexer: The indexer to use for building and sending the actions.
+    :param records: An iterable of (already committed) records.
+    :param refresh: The ``refresh`` parameter for Elasticsearch.
+    :param kwargs: Passed to :func:`elasticsearch.helpers.bulk`.
+    :returns: The number of successfully indexed records.
+    """
+    actions = (_index_action(indexer, record) for record in records)
+    if refresh:
+        kwargs["refresh"] = refresh
+
+    success, _ = bulk(
+        indexer.client,
+        actions,
+        stats_only=True,
+        request_timeout=current_app.config["INDEXER_BULK_REQUEST_TIMEOUT"],
+        **kwargs,
+    )
+    return success
+
+
+def commit_records(records):
+    """Commit many records within a single savepoint."""
+    with db.session.begin_nested():
+        for record in records:
+            record.commit()
+
+
+def insert_records(records):
+    """Insert many new records with a single flush.
+
+    The records must have been built without adding them to the DB session
+    (e.g. with ``RequestEvent.build()``).
+    As with ``Record.commit()``, the pre/post commit extensions are run and
+    the records are validated, but all of them are inserted together instead
+    of being inserted on creation and updated on commit.
+    """
+    with db.session.begin_nested():
+        for record in records:
+            for e in record._extensions:
+                e.pre_commit(record)
+            # validate also encodes the data
+            record.model.json = record._validate()
+        db.session.add_all([record.model for record in records])
+
+    for record in records:
+        for e in record._extensions:
+            e.post_commit(record)
+
+
+#
+# Unit of work operations
+#
+class IndexRefreshOp(Operation):
+    """Refresh each index written to within the unit of work, once.
+
+    The indices are refreshed after all operations have been committed, so
+    that all of their index requests are covered.
+    Use :func:`register_index_refresh` instead of registering it directly.
+    """
+
+    def __init__(self):
+        """Initialize the refresh operation."""
+        self._indexers = {}
+
+    def add(self, indexer):
+        """Add the index of the indexer to the indices to refresh."""
+        self._indexers.setdefault(indexer.record_cls, indexer)
+
+    def on_post_commit(self, uow):
+        """Refresh the indices."""
+        for indexer in self._indexers.values():
+            indexer.refresh()
+
+
+_refresh_ops = WeakKeyDictionary()
+"""The refresh operation of each unit of work (if there is one)."""
+
+
+def register_index_refresh(uow, indexer):
+    """Refresh the index of the indexer after the unit of work is committed.
+
+    Each index is refreshed at most once per unit of work.
+    """
+    op = _refresh_ops.get(uow)
+    if op is None:
+        op = _refresh_ops[uow] = IndexRefreshOp()
+        uow.register(op)
+    op.add(indexer)
+
+
+class RefreshStrategyMixin:
+    """Mixin for operations which index with the refresh strategy."""
+
+    def _init_refresh(self, index_refresh):
+        """Resolve the refresh strategy."""
+        self._refresh_strategy = get_refresh_strategy(index_refresh)
+
+    def _register_refresh(self, uow):
+        """Register the coalesced refresh, if it's the strategy."""
+        if self._indexer is not None and self._refresh_strategy == "coalesced":
+            register_index_refresh(uow, self._indexer)
+
+    @property
+    def _refresh_argument(self):
+        """The ``refresh`` argument of the index requests."""
+        return refresh_argument(self._refresh_strategy)
+
+
+class RecordCommitOp(RefreshStrategyMixin, _RecordCommitOp):
+    """Record commit operation, with the configured refresh strategy."""
+
+    def __init__(self, record, indexer=None, index_refresh=None):
+        """Initialize the record commit operation."""
+        super().__init__(record, indexer=indexer)
+        self._init_refresh(index_refresh)
+
+    def on_register(self, uow):
+        """Commit the record."""
+        super().on_register(uow)
+        self._register_refresh(uow)
+
+    def on_commit(self, uow):
+        """Index the record."""
+        if self._indexer is not None:
+            refresh = self._refresh_argument
+            arguments = {"refresh": refresh} if refresh else {}
+            self._indexer.index(self._record, arguments=arguments)
+
+
+class RecordIndexOp(RecordCommitOp):
+    """Record index operation (without committing the record)."""
+
+    def on_register(self, uow):
+        """No commit operation."""
+        self._register_refresh(uow)
+
+
+class RecordDeleteOp(RefreshStrategyMixin, _RecordDeleteOp):
+    """Record delete operation, with the configured refresh strategy."""
+
+    def __init__(self, record, indexer=None, force=False, index_refresh=None):
+        """Initialize the record delete operation."""
+        super().__init__(record, indexer=indexer, force=force)
+        self._init_refresh(index_refresh)
+
+    def on_register(self, uow):
+        """Delete the record."""
+        super().on_register(uow)
+        self._register_refresh(uow)
+
+    def on_commit(self, uow):
+        """Delete the record from the index."""
+        if self._indexer is not None:
+            refresh = self._refresh_argument
+            kwargs = {"refresh": refresh} if refresh else {}
+            self._indexer.delete(self._record, **kwargs)
+
+
+class RecordBulkCommitOp(RefreshStrategyMixin, Operation):
+    """Commit operation for many records, with bulk indexing."""
+
+    def __init__(self, records, indexer=None, index_refresh=None):
+        """Initialize the bulk commit operation."""
+        self._records = list(records)
+        self._indexer = indexer
+        self._init_refresh(index_refresh)
+
+    def on_register(self, uow):
+        """Commit all records within a single savepoint."""
+        commit_records(self._records)
+        self._register_refresh(uow)
+
+    def on_commit(self, uow):
+        """Index all records with a single bulk request."""
+        if self._indexer is not None and self._records:
+            # the committed rows are loaded again with a single query
+            records = self._indexer.record_cls.get_records(
+                [record.id for record in self._records]
+            )
+            index_records(self._indexer, records, refresh=self._refresh_argument)
+
+
+class RecordBulkInsertOp(RecordBulkCommitOp):
+    """Insert operation for many new records, with bulk indexing."""
+
+    def on_register(self, uow):
+        """Insert all records with a single flush."""
+        insert_records(self._records)
+        self._register_refresh(uow)
+
+
+_PARENT_SYNC_SCRIPT = "ctx._source.parent = params.parents[ctx._source.request_id]"
+
+
+class ParentSyncOp(RefreshStrategyMixin, Operation):
+    """Update the fields of the requests which are indexed with their events.
+
+    The indexed events of all given requests are updated with a single
+    update by query, instead of reindexing them one by one.
+    """
+
+    def __init__(self, requests, indexer, index_refresh=None):
+        """Initialize the sync operation.
+
+        :param requests: The changed requests.
+        :param indexer: The indexer of the events.
+        """
+        self._requests = list(requests)
+        self._indexer = indexer
+        self._init_refresh(index_refresh)
+
+    def on_register(self, uow):
+        """Register the coalesced refresh, if it's the strategy."""
+        self._register_refresh(uow)
+
+    def on_commit(self, uow):
+        """Update the indexed events of the requests."""
+        if not self._requests:
+            return
+
+        parents = {str(r.id): parent_fields(r) for r in self._requests}
+        kwargs = {}
+        if self._refresh_strategy == "immediate":
+            # update by query doesn't support waiting for the next refresh
+            kwargs["refresh"] = True
+
+        # imported here, as the events service depends on this module
+        from .events.indexer import events_routing
+
+        routing = events_routing(parents)
+        if routing is not None:
+            kwargs["routing"] = routing
+
+        self._indexer.client.update_by_query(
+            index=build_alias_name(self._indexer.record_cls.index._name),
+            body={
+                "query": {"terms": {"request_id": list(parents)}},
+                "script": {
+                    "source": _PARENT_SYNC_SCRIPT,
+                    "lang": "painless",
+                    "params": {"parents": parents},
+                },
+            },
+            conflicts="proceed",
+            **kwargs,
+        )
+
+
+class TimelinePublishOp(Operation):
+    """Publish the changes of events to the timeline subscribers.
+
+    The messages are only published after the transaction has been committed
+    (and the events have been indexed), so subscribers never see changes that
+    were rolled back.
+    """
+
+    def __init__(self, events, change):
+        """Initialize the publish operation.
+
+        :param events: The changed events.
+        :param change: The kind of change (``created``, ``updated`` or
+                       ``deleted``).
+        """
+        self._messages = [
+            {
+                "request_id": str(event.request_id),
+                "event_id": str(event.id),
+                "change": change,
+            }
+            for event in events
+        ]
+
+    def on_post_commit(self, uow):
+        """Publish the messages on the channels of the events' requests."""
+        broker = current_requests.timeline_broker
+        if broker is None:
+            return
+
+        for message in self._messages:
+            broker.publish(message["request_id"], message)
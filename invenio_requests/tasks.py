@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2022 CERN.
+#
+# Invenio-Requests is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Celery tasks for requests."""
+
+from celery import shared_task
+from flask import current_app
+from invenio_access.permissions import system_identity
+from invenio_db import db
+
+from .proxies import current_requests_service
+from .records.models import RequestNumber
+
+
+@shared_task(ignore_result=True)
+def cleanup_request_numbers():
+    """Remove the left-over rows from the request number sequence table."""
+    RequestNumber.cleanup()
+    db.session.commit()
+
+
+@shared_task(ignore_result=True)
+def expire_requests():
+    """Expire all open requests whose expiration date has passed."""
+    current_requests_service.expire_requests(
+        system_identity,
+        batch_size=current_app.config["REQUESTS_EXPIRE_BATCH_SIZE"],
+    )
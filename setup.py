@@ -93,6 +93,12 @@ setup(
             "invenio_requests = invenio_requests.views:create_requests_bp",
             "invenio_request_events = invenio_requests.views:create_request_events_bp"  # noqa
         ],
+        "flask.commands": [
+            "requests = invenio_requests.cli:requests",
+        ],
+        "invenio_celery.tasks": [
+            "invenio_requests = invenio_requests.tasks",
+        ],
         "invenio_db.alembic": [
             "invenio_requests = invenio_requests:alembic",
         ],
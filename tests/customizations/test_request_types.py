@@ -12,7 +12,7 @@ from invenio_access.permissions import system_identity
 from invenio_records_permissions.generators import AnyUser, SystemProcess
 
 from invenio_requests.customizations import RequestState
-from invenio_requests.customizations.base import RequestAction
+from invenio_requests.customizations.base import RequestAction, RequestActions
 from invenio_requests.customizations.default import DefaultRequestType
 from invenio_requests.errors import NoSuchActionError
 from invenio_requests.records.api import Request
@@ -175,3 +175,34 @@ def test_customized_statuses(customized_app):
         with pytest.raises(ValueError):
             # same as above, but the other way around
             default_req.status = status
+
+
+def test_precomputed_action_availability(customized_app, identity_simple):
+    """Test if the precomputed availability matches the per-request checks."""
+    default_req = Request.create({}, type=DefaultRequestType)
+    custom_req = Request.create({}, type=CustomizedReferenceRequestType)
+
+    for identity in [identity_simple, system_identity, None]:
+        for status in default_req.type.available_statuses:
+            default_req.status = status
+            for name in default_req.type.available_actions:
+                action = RequestActions.get_action(default_req, name)
+                expected = action.is_available(
+                    status, identity is system_identity
+                )
+                assert RequestActions.can_execute(
+                    identity, default_req, name
+                ) == expected
+
+        # the test action overrides `can_execute()` and is checked per request
+        availability = RequestActions._get_availability(identity, custom_req)
+        assert availability == {"test": None}
+        assert RequestActions.can_execute(identity, custom_req, "test")
+
+    # expiring requests is reserved for system processes
+    default_req.status = "open"
+    assert RequestActions.can_execute(system_identity, default_req, "expire")
+    assert not RequestActions.can_execute(identity_simple, default_req, "expire")
+
+    with pytest.raises(NoSuchActionError):
+        RequestActions.can_execute(identity_simple, default_req, "nonexistent")
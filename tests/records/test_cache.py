@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2022 CERN.
+#
+# Invenio-Requests is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Test the in-process caches."""
+
+from unittest.mock import patch
+
+import pytest
+from invenio_access.permissions import system_identity
+from invenio_db import db
+
+from invenio_requests.proxies import current_requests
+from invenio_requests.records.api import Request
+from invenio_requests.records.cache import (
+    LocalInvalidationChannel,
+    LRUCache,
+    RecordCache,
+    register_session_listeners,
+)
+
+
+def test_lru_cache():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    # "b" is the least recently used entry
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+    cache.delete("a")
+    assert cache.get("a", "default") == "default"
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_lru_cache_disabled():
+    cache = LRUCache(maxsize=0)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+
+
+def test_lru_cache_ttl():
+    cache = LRUCache(maxsize=2, ttl=10)
+    with patch("invenio_requests.records.cache.time.monotonic", return_value=0):
+        cache.set("a", 1)
+    with patch("invenio_requests.records.cache.time.monotonic", return_value=5):
+        assert cache.get("a") == 1
+    with patch("invenio_requests.records.cache.time.monotonic", return_value=10):
+        assert cache.get("a") is None
+
+
+def test_record_cache():
+    channel = LocalInvalidationChannel()
+    cache = RecordCache(maxsize=10, channel=channel)
+    other_cache = RecordCache(maxsize=10, channel=channel)
+
+    data = {"title": "Foo"}
+    cache.set("id", 1, data)
+    other_cache.set("id", 1, data)
+
+    # entries are validated by the version and returned as copies
+    assert cache.get("id", 2) is None
+    cached = cache.get("id", 1)
+    assert cached == data and cached is not data
+    cached["title"] = "Bar"
+    assert cache.get("id", 1) == data
+
+    # invalidations are broadcasted to all caches on the channel
+    cache.invalidate("id")
+    assert cache.get("id", 1) is None
+    assert other_cache.get("id", 1) is None
+
+
+@pytest.fixture()
+def record_cache(app):
+    """Enable the record cache."""
+    ext = current_requests._get_current_object()
+    ext.request_record_cache = RecordCache(maxsize=10)
+    register_session_listeners()
+    yield ext.request_record_cache
+    ext.request_record_cache = None
+
+
+def test_get_record_cached(app, example_request, record_cache):
+    request_id = example_request.id
+    db.session.commit()
+    db.session.expire_all()
+
+    request = Request.get_record(request_id)
+    version_id = request.model.version_id
+    assert record_cache.get(request_id, version_id) == dict(request)
+
+    # a cached request is equal to a loaded one, and can be modified
+    db.session.commit()
+    cached = Request.get_record(request_id)
+    assert dict(cached) == dict(request)
+
+    current_requests.requests_service.update(
+        system_identity, request_id, {"title": "New", "receiver": {"user": "2"}}
+    )
+    # the request was invalidated after the commit
+    assert len(record_cache._cache) == 0
+    assert Request.get_record(request_id)["title"] == "New"
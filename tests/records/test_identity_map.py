@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2022 CERN.
+#
+# Invenio-Requests is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Test the identity map for requests and events."""
+
+from unittest.mock import patch
+
+from invenio_access.permissions import system_identity
+from invenio_db import db
+
+from invenio_requests.proxies import current_events_service, current_requests
+from invenio_requests.records.api import Request, RequestEvent
+from invenio_requests.records.models import RequestMetadata
+from invenio_requests.resolvers.requests import RequestResolver
+
+
+def test_identity_map(app, example_request):
+    request_id = example_request.id
+
+    # loaded requests are reused within the same transaction
+    request = Request.get_record(request_id)
+    assert Request.get_record(request_id) is request
+    assert Request.get_record(example_request.number) is request
+    assert current_events_service._get_request(request_id) is request
+
+    ref_dict = RequestResolver().reference_entity(request)
+    proxy = RequestResolver().get_entity_proxy(ref_dict)
+    assert proxy.resolve() is request
+
+    # ... but not across transactions
+    db.session.commit()
+    assert Request.get_record(request_id) is not request
+
+    request = Request.get_record(request_id)
+    db.session.rollback()
+    assert Request.get_record(request_id) is not request
+
+
+def test_identity_map_execute_action(app, example_request):
+    request_id = example_request.id
+    db.session.commit()
+    data = {"payload": {"content": "Comment", "format": "html"}}
+
+    with patch.object(
+        RequestMetadata, "query", wraps=RequestMetadata.query
+    ) as query:
+        current_requests.requests_service.execute_action(
+            system_identity, request_id, "submit", data
+        )
+
+    # the request is loaded once for the action and both events
+    assert query.filter_by.call_count == 1
+
+
+def test_identity_map_events(app, example_request):
+    item = current_events_service.create(
+        system_identity,
+        example_request.id,
+        {"type": "C", "payload": {"content": "Hi", "format": "html"}},
+    )
+    event = RequestEvent.get_record(item.id)
+    assert RequestEvent.get_record(item.id) is event
+
+    event.delete()
+    assert RequestEvent.get_record(item.id, with_deleted=True) is not event
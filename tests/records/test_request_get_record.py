@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2022 CERN.
+#
+# Invenio-Requests is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Test looking up requests by their ID or number."""
+
+import pytest
+from sqlalchemy.orm.exc import NoResultFound
+
+from invenio_requests.proxies import current_requests
+from invenio_requests.records.api import Request
+from invenio_requests.resolvers.requests import RequestResolver
+
+
+def test_get_record_by_number(app, example_request):
+    cache = current_requests.request_number_cache
+    cache.clear()
+
+    by_id = Request.get_record(example_request.id)
+    by_number = Request.get_record(example_request.number)
+    assert by_id.id == by_number.id == example_request.id
+
+    # the number is now mapped to the ID
+    assert cache.get(example_request.number) == example_request.id
+    assert Request.get_record(example_request.number).id == example_request.id
+
+    with pytest.raises(NoResultFound):
+        Request.get_record("XXXXX")
+
+
+def test_get_record_by_number_stale_cache(app, example_request):
+    cache = current_requests.request_number_cache
+    cache.set(example_request.number, "00000000-0000-0000-0000-000000000000")
+
+    request = Request.get_record(example_request.number)
+    assert request.id == example_request.id
+    assert cache.get(example_request.number) == example_request.id
+
+
+def test_resolve_request_by_number(app, example_request):
+    resolver = RequestResolver()
+    ref_dict = resolver.reference_entity(example_request)
+    assert ref_dict == {"request": example_request.number}
+    assert resolver.get_entity_proxy(ref_dict).resolve().id == example_request.id
@@ -9,6 +9,9 @@
 
 """Request number identifier model tests."""
 
+import threading
+
+from invenio_requests.records.allocator import SequenceAllocator
 from invenio_requests.records.models import RequestNumber
 
 
@@ -39,3 +42,90 @@ def test_request_number(app, db):
     RequestNumber.insert(7)
     assert RequestNumber.max() == 11
     assert RequestNumber.next() == 12
+
+
+def test_request_number_next_many(app, db):
+    """Test allocating several values at once."""
+    start = RequestNumber.max()
+    values = RequestNumber.next_many(3)
+
+    assert values == [start + 1, start + 2, start + 3]
+    assert RequestNumber.next() == start + 4
+    assert RequestNumber.next_many(0) == []
+
+
+def test_request_number_reserve_block(app, db):
+    """Test reserving a block of values."""
+    start = RequestNumber.max()
+
+    assert RequestNumber.reserve_block(10) == (start + 1, start + 10)
+    assert RequestNumber.max() == start + 10
+    assert RequestNumber.next() == start + 11
+
+    # only the highest row is kept after the cleanup
+    assert RequestNumber.cleanup() > 0
+    assert RequestNumber.query.count() == 1
+    assert RequestNumber.max() == start + 11
+    assert RequestNumber.next() == start + 12
+
+
+def test_request_number_reserve_blocks_of_different_sizes(app, db):
+    """Test that blocks of different sizes and single values don't overlap."""
+    start = RequestNumber.max()
+
+    assert RequestNumber.reserve_block(3) == (start + 1, start + 3)
+    assert RequestNumber.next() == start + 4
+    assert RequestNumber.reserve_block(10) == (start + 5, start + 14)
+    assert RequestNumber.reserve_block(1) == (start + 15, start + 15)
+    assert RequestNumber.next() == start + 16
+
+
+def test_request_number_reserve_block_concurrently(app, db):
+    """Test that concurrent reservations of different sizes don't overlap."""
+    sizes = [1, 5, 2, 10, 3, 7] * 3
+    blocks = []
+
+    def reserve(size):
+        with app.app_context():
+            blocks.append(RequestNumber.reserve_block(size))
+
+    threads = [threading.Thread(target=reserve, args=(size,)) for size in sizes]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(blocks) == len(sizes)
+    assert sorted(last - first + 1 for first, last in blocks) == sorted(sizes)
+    values = [value for first, last in blocks for value in range(first, last + 1)]
+    assert len(set(values)) == sum(sizes)
+
+
+def test_sequence_allocator(app, db):
+    """Test handing out values from reserved blocks."""
+    allocator = SequenceAllocator(RequestNumber, block_size=5)
+    start = RequestNumber.max()
+
+    assert allocator.next() == start + 1
+    assert allocator.next_many(3) == [start + 2, start + 3, start + 4]
+    # the block was reserved with a single row
+    assert RequestNumber.max() == start + 5
+
+    # requests spanning several blocks reserve a large enough block
+    assert allocator.next_many(7) == list(range(start + 5, start + 12))
+    assert RequestNumber.max() == start + 11
+
+    # stale blocks are abandoned, leaving a gap
+    allocator = SequenceAllocator(RequestNumber, block_size=5, max_age=0)
+    assert allocator.next() == start + 12
+    assert allocator.next() == start + 17
+
+
+def test_sequence_allocator_without_blocks(app, db):
+    """Test that a block size of 1 uses the sequence directly."""
+    allocator = SequenceAllocator(RequestNumber)
+    start = RequestNumber.max()
+
+    assert allocator.next() == start + 1
+    assert allocator.next_many(2) == [start + 2, start + 3]
+    assert RequestNumber.max() == start + 3
@@ -216,3 +216,82 @@ def test_empty_comment(
     )
     assert 400 == response.status_code
     assert expected_json == response.json
+
+
+def test_conditional_read(
+    app, client_logged_as, headers, events_resource_data, example_request
+):
+    """Test the ETag and If-None-Match handling when reading comments."""
+    request_id = example_request.id
+    client = client_logged_as("user1@example.org")
+    response = client.post(
+        f"/requests/{request_id}/comments", headers=headers, json=events_resource_data
+    )
+    comment_url = f"/requests/{request_id}/comments/{response.json['id']}"
+
+    response = client.get(comment_url, headers=headers)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    # unchanged comment
+    response = client.get(comment_url, headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert not response.data
+
+    # changing the request changes the tags of its comments too
+    client.post(f"/requests/{request_id}/actions/submit", headers=headers)
+    response = client.get(comment_url, headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+    # the tag is specific to the identity
+    etag = response.headers["ETag"]
+    client = client_logged_as("user2@example.org")
+    response = client.get(comment_url, headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_timeline_query_args(
+    app, client_logged_as, headers, events_resource_data, example_request
+):
+    """Test the cursor, since and fields arguments of the timeline."""
+    client = client_logged_as("user1@example.org")
+    request_id = example_request.id
+    timeline_url = f"/requests/{request_id}/timeline"
+    comment_ids = [
+        client.post(
+            f"/requests/{request_id}/comments",
+            headers=headers,
+            json=events_resource_data,
+        ).json["id"]
+        for _ in range(2)
+    ]
+    RequestEvent.index.refresh()
+
+    # cursor
+    response = client.get(f"{timeline_url}?size=1", headers=headers)
+    assert response.status_code == 200
+    assert [hit["id"] for hit in response.json["hits"]["hits"]] == comment_ids[:1]
+    next_url = response.json["links"]["next"]
+    assert "cursor=" in next_url
+    response = client.get(
+        next_url.replace("https://127.0.0.1:5000/api", ""), headers=headers
+    )
+    assert response.status_code == 200
+    assert [hit["id"] for hit in response.json["hits"]["hits"]] == comment_ids[1:]
+
+    # since
+    response = client.get(f"{timeline_url}?since=2000-01-01T00:00:00", headers=headers)
+    assert response.status_code == 200
+    assert response.json["hits"]["total"] == 2
+    response = client.get(f"{timeline_url}?since=2999-01-01T00:00:00", headers=headers)
+    assert response.status_code == 200
+    assert response.json["hits"]["total"] == 0
+
+    # fields
+    response = client.get(f"{timeline_url}?fields=id,type", headers=headers)
+    assert response.status_code == 200
+    for hit in response.json["hits"]["hits"]:
+        assert set(hit) == {"id", "type"}
@@ -9,6 +9,7 @@
 """Request resource tests."""
 
 import copy
+import json
 
 
 def assert_api_response_json(expected_json, received_json):
@@ -148,6 +149,9 @@ def test_simple_request_flow(app, client_logged_as, headers, example_request):
         "is_closed": False,
         "expires_at": None,
         "is_expired": False,
+        "events_count": 0,
+        "comments_count": 0,
+        "last_activity_at": None,
         "links": {
             "self": f"https://127.0.0.1:5000/api/requests/{id_}",
             "timeline": f"https://127.0.0.1:5000/api/requests/{id_}/timeline",
@@ -180,11 +184,14 @@ def test_simple_request_flow(app, client_logged_as, headers, example_request):
     )
     assert_api_response(response, 200, expected_data)
 
-    # cancel the request
+    # cancel the request (which creates an event)
     url = response.json["links"]["actions"]["cancel"]
     response = client.post(url[len("https://127.0.0.1:5000/api") :], headers=headers)
+    assert response.json["last_activity_at"] is not None
     expected_data.update(
         {
+            "events_count": 1,
+            "last_activity_at": response.json["last_activity_at"],
             "status": "cancelled",
             "is_closed": True,
             "is_open": False,
@@ -197,3 +204,84 @@ def test_simple_request_flow(app, client_logged_as, headers, example_request):
         }
     )
     assert_api_response(response, 200, expected_data)
+
+
+def test_read_many(app, client_logged_as, headers, example_requests):
+    """Test looking up several requests by their IDs or numbers."""
+    client = client_logged_as("admin@example.org")
+    req1, req2, req3 = example_requests
+
+    response = client.get(
+        f"/requests/?ids={req3.number}&ids={req1.id}&ids=unknown",
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert response.json["hits"]["total"] == 2
+    hits = response.json["hits"]["hits"]
+    assert [hit["id"] for hit in hits] == [str(req3.id), str(req1.id)]
+
+
+def test_sparse_fieldsets(app, client_logged_as, headers, example_requests):
+    """Test limiting the results to the requested fields."""
+    client = client_logged_as("admin@example.org")
+    req1 = example_requests[0]
+
+    response = client.get(f"/requests/{req1.id}?fields=id,number", headers=headers)
+    assert response.status_code == 200
+    assert response.json == {"id": str(req1.id), "number": req1.number}
+
+    response = client.get("/requests/?fields=number,title", headers=headers)
+    assert response.status_code == 200
+    for hit in response.json["hits"]["hits"]:
+        assert set(hit) == {"number", "title"}
+
+
+def test_export(app, client_logged_as, headers, example_requests):
+    """Test streaming all matching requests as newline-delimited JSON."""
+    client = client_logged_as("admin@example.org")
+    req1, req2, req3 = example_requests
+
+    response = client.get("/requests/export?receiver=user:1&size=1", headers=headers)
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+
+    # the pagination is ignored, all matching requests are exported
+    lines = response.get_data(as_text=True).splitlines()
+    numbers = {json.loads(line)["number"] for line in lines}
+    assert numbers == {req1.number, req2.number}
+
+
+def test_conditional_read(app, client_logged_as, headers, example_request):
+    """Test the ETag and If-None-Match handling when reading requests."""
+    client = client_logged_as("user1@example.org")
+    request_url = f"/requests/{example_request.id}"
+
+    response = client.get(request_url, headers=headers)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    # unchanged request, also when looked up by its number
+    response = client.get(request_url, headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert not response.data
+    response = client.get(
+        f"/requests/{example_request.number}",
+        headers={**headers, "If-None-Match": etag},
+    )
+    assert response.status_code == 304
+
+    # other representations have other tags
+    response = client.get(
+        f"{request_url}?fields=id", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+
+    # forged tags don't match
+    response = client.get(request_url, headers={**headers, "If-None-Match": '"0"'})
+    assert response.status_code == 200
+
+    # changing the request changes its tag
+    client.post(f"{request_url}/actions/submit", headers=headers)
+    response = client.get(request_url, headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
@@ -9,14 +9,22 @@
 
 """Service tests."""
 import copy
+from datetime import datetime, timedelta
 
 import pytest
+from elasticsearch import VERSION as ES_VERSION
 from invenio_access.permissions import system_identity
+from invenio_db import db
+from invenio_records_resources.services.errors import (
+    PermissionDeniedError,
+    QuerystringValidationError,
+)
 from marshmallow import ValidationError
 from sqlalchemy.orm.exc import NoResultFound
 
 from invenio_requests.proxies import current_requests
-from invenio_requests.records.api import RequestEvent, RequestEventType
+from invenio_requests.records.api import Request, RequestEvent, RequestEventType
+from invenio_requests.services.events.pubsub import LocalTimelineBroker
 
 
 def test_schemas(app, events_service_data, example_request):
@@ -121,3 +129,315 @@ def test_update_keeps_type(identity_simple, events_service_data, example_request
 
     updated_item_dict = updated_item.to_dict()
     assert item_dict["type"] == updated_item_dict["type"]
+
+
+def test_cursor_pagination(
+    app, identity_simple, events_service_data, example_request,
+    request_events_service
+):
+    request_id = example_request.id
+    for _ in range(3):
+        request_events_service.create(
+            identity_simple, request_id, events_service_data
+        )
+    RequestEvent.index.refresh()
+
+    page_1 = request_events_service.search(identity_simple, request_id, size=2)
+    assert page_1.next_cursor is not None
+    next_link = page_1.to_dict()["links"]["next"]
+    assert "cursor=" in next_link and "page=" not in next_link
+
+    page_2 = request_events_service.search(
+        identity_simple, request_id, size=2, cursor=page_1.next_cursor
+    )
+    ids_1 = [hit["id"] for hit in page_1.hits]
+    ids_2 = [hit["id"] for hit in page_2.hits]
+    assert len(ids_1) == 2 and len(ids_2) >= 1
+    assert not set(ids_1) & set(ids_2)
+
+
+def test_incremental_search(
+    app, identity_simple, events_service_data, example_request,
+    request_events_service
+):
+    request_id = example_request.id
+    ids = [
+        request_events_service.create(
+            identity_simple, request_id, events_service_data
+        ).id
+        for _ in range(3)
+    ]
+    RequestEvent.index.refresh()
+
+    # everything after the first event
+    result = request_events_service.search(
+        identity_simple, request_id, after_id=str(ids[0])
+    )
+    found = [hit["id"] for hit in result.hits]
+    assert set(found) == {str(id_) for id_ in ids[1:]}
+
+    # updating an event moves it to the end of the timeline
+    first = RequestEvent.get_record(ids[0])
+    since = first.updated
+    data = copy.deepcopy(events_service_data)
+    data["payload"]["content"] = "Edited."
+    request_events_service.update(identity_simple, ids[0], data)
+    RequestEvent.index.refresh()
+
+    result = request_events_service.search(identity_simple, request_id, since=since)
+    found = [hit["id"] for hit in result.hits]
+    assert found[-1] == str(ids[0])
+
+    # nothing changed since the last update
+    last_update = RequestEvent.get_record(ids[0]).updated
+    result = request_events_service.search(
+        identity_simple, request_id, since=last_update, after_id=str(ids[0])
+    )
+    assert result.total == 0
+
+
+@pytest.mark.skipif(ES_VERSION[0] < 7, reason="needs date_nanos")
+def test_incremental_search_within_millisecond(
+    app, identity_simple, events_service_data, example_request,
+    request_events_service
+):
+    request_id = example_request.id
+    ids = sorted(
+        str(
+            request_events_service.create(
+                identity_simple, request_id, events_service_data
+            ).id
+        )
+        for _ in range(2)
+    )
+    # the event with the smaller ID is updated later, within the same millisecond
+    updated = datetime(2022, 1, 1, 12, 0, 0, 123100)
+    model_cls = RequestEvent.model_cls
+    timestamps = [updated, updated.replace(microsecond=123600)]
+    for id_, timestamp in zip(ids[::-1], timestamps):
+        db.session.query(model_cls).filter(model_cls.id == id_).update(
+            {"updated": timestamp}, synchronize_session=False
+        )
+    db.session.commit()
+    for id_ in ids:
+        request_events_service.indexer.index(RequestEvent.get_record(id_))
+    RequestEvent.index.refresh()
+
+    result = request_events_service.search(
+        identity_simple, request_id, after_id=ids[1]
+    )
+    assert [hit["id"] for hit in result.hits] == ids[:1]
+
+
+def test_timeline_from_db(
+    app, monkeypatch, identity_simple, events_service_data, example_request,
+    request_events_service
+):
+    monkeypatch.setitem(app.config, "REQUESTS_TIMELINE_FROM_DB", True)
+    request_id = example_request.id
+    ids = [
+        str(
+            request_events_service.create(
+                identity_simple, request_id, events_service_data
+            ).id
+        )
+        for _ in range(3)
+    ]
+
+    # the events are read without refreshing the index, with keyset pagination
+    page_1 = request_events_service.search(identity_simple, request_id, size=2)
+    assert page_1.total == 3
+    assert [hit["id"] for hit in page_1.hits] == ids[:2]
+    assert page_1.next_cursor is not None
+
+    page_2 = request_events_service.search(
+        identity_simple, request_id, size=2, cursor=page_1.next_cursor
+    )
+    assert [hit["id"] for hit in page_2.hits] == ids[2:]
+    assert page_2.next_cursor is None
+
+    newest = request_events_service.search(
+        identity_simple, request_id, sort="newest"
+    )
+    assert [hit["id"] for hit in newest.hits] == ids[::-1]
+
+    # deletions are visible right away
+    request_events_service.delete(identity_simple, ids[0])
+    result = request_events_service.search(identity_simple, request_id)
+    hit = next(hit for hit in result.hits if hit["id"] == ids[0])
+    assert hit["type"] == RequestEventType.REMOVED.value
+
+    with pytest.raises(QuerystringValidationError):
+        request_events_service.search(identity_simple, request_id, cursor="foo")
+
+
+def test_search_all_events(
+    app, identity_simple, identity_simple_2, identity_stranger,
+    events_service_data, create_request, requests_service,
+    request_events_service
+):
+    # a comment on a draft request
+    request = create_request(identity_simple)
+    item = request_events_service.create(
+        identity_simple, request.id, events_service_data
+    )
+    event_id = str(item.id)
+    RequestEvent.index.refresh()
+
+    def _found(identity):
+        result = request_events_service.search(identity, None, size=100)
+        return {hit["id"] for hit in result.hits}
+
+    assert event_id in _found(identity_simple)
+    # receivers don't see the events of drafts
+    assert event_id not in _found(identity_simple_2)
+    with pytest.raises(PermissionDeniedError):
+        request_events_service.search(identity_stranger, None)
+
+    # changes of the request are synced to the indexed events
+    requests_service.execute_action(identity_simple, request.id, "submit")
+    assert event_id in _found(identity_simple_2)
+    result = request_events_service.search(
+        system_identity,
+        None,
+        q=f"request_id:{request.id} AND parent.is_open:true",
+    )
+    assert event_id in {hit["id"] for hit in result.hits}
+
+
+def test_events_routing(
+    app, monkeypatch, identity_simple, events_service_data, example_request,
+    request_events_service
+):
+    monkeypatch.setitem(app.config, "REQUESTS_EVENTS_ROUTING", True)
+    request_id = str(example_request.id)
+    assert request_events_service.rebuild_index(system_identity, recreate=True) == 0
+
+    item = request_events_service.create(
+        identity_simple, request_id, events_service_data
+    )
+    event_id = str(item.id)
+
+    # the bulk actions are routed by the request as well
+    action = request_events_service.indexer._index_action({"id": event_id})
+    assert action["routing"] == request_id
+
+    RequestEvent.index.refresh()
+    result = request_events_service.search(identity_simple, request_id)
+    assert [hit["id"] for hit in result.hits] == [event_id]
+
+    assert request_events_service.rebuild_index(system_identity) == 1
+    RequestEvent.index.refresh()
+    result = request_events_service.search(identity_simple, request_id)
+    assert result.total == 1
+
+
+def test_create_many(
+    app, identity_simple, events_service_data, example_request,
+    request_events_service
+):
+    request_id = example_request.id
+    events = []
+    for i in range(3):
+        data = copy.deepcopy(events_service_data)
+        data["payload"]["content"] = f"Comment {i}."
+        events.append(data)
+
+    items = request_events_service.create_many(identity_simple, request_id, events)
+    assert len(items) == 3
+    assert [item.to_dict()["payload"]["content"] for item in items] == [
+        "Comment 0.", "Comment 1.", "Comment 2."
+    ]
+    assert all(
+        item.to_dict()["created_by"] == {"user": str(identity_simple.id)}
+        for item in items
+    )
+
+    # the events are indexed and counted
+    RequestEvent.index.refresh()
+    result = request_events_service.search(identity_simple, request_id)
+    assert {hit["id"] for hit in result.hits} >= {str(item.id) for item in items}
+    assert Request.get_record(request_id).comments_count == 3
+
+    # nothing is created if any of the events is invalid
+    invalid = copy.deepcopy(events_service_data)
+    invalid["type"] = "INVALID"
+    with pytest.raises(ValidationError):
+        request_events_service.create_many(
+            identity_simple, request_id, [events_service_data, invalid]
+        )
+    assert Request.get_record(request_id).comments_count == 3
+
+
+def test_import_many(
+    app, identity_simple, users, events_service_data, example_request,
+    request_events_service
+):
+    request_id = example_request.id
+    creator = {"user": str(users[1].id)}
+    created = datetime(2020, 1, 1, 12, 0)
+    items = [
+        {
+            "data": events_service_data,
+            "created_by": creator,
+            "created": created + timedelta(minutes=i),
+        }
+        for i in range(2)
+    ]
+
+    # only allowed for system processes
+    with pytest.raises(PermissionDeniedError):
+        request_events_service.import_many(identity_simple, request_id, items)
+
+    results = request_events_service.import_many(system_identity, request_id, items)
+    for i, item in enumerate(results):
+        event = RequestEvent.get_record(item.id)
+        assert event.created == created + timedelta(minutes=i)
+        assert item.to_dict()["created_by"] == creator
+
+    request = Request.get_record(request_id)
+    assert request.last_activity_at == created + timedelta(minutes=1)
+
+
+def test_stream(
+    app, identity_simple, identity_stranger, events_service_data, example_request,
+    request_events_service
+):
+    request_id = example_request.id
+    changes = request_events_service.stream(
+        identity_simple, request_id, timeout=5, keepalive=0.1
+    )
+
+    # without changes, only keep-alives are sent
+    assert next(changes) is None
+
+    item = request_events_service.create(
+        identity_simple, request_id, events_service_data
+    )
+    change, data = next(changes)
+    assert change == "created"
+    assert data["id"] == str(item.id)
+    assert data["payload"] == events_service_data["payload"]
+
+    request_events_service.delete(identity_simple, item.id)
+    change, data = next(changes)
+    assert change == "deleted"
+    assert data["id"] == str(item.id)
+    changes.close()
+
+    # only identities allowed to see the timeline can subscribe
+    with pytest.raises(PermissionDeniedError):
+        request_events_service.stream(identity_stranger, request_id)
+
+
+def test_local_timeline_broker():
+    broker = LocalTimelineBroker(max_queue_size=1)
+    with broker.subscribe("a") as sub_a, broker.subscribe("b") as sub_b:
+        broker.publish("a", {"n": 1})
+        broker.publish("a", {"n": 2})  # dropped, the queue is full
+
+        assert sub_a.get(timeout=0.1) == {"n": 1}
+        assert sub_a.get(timeout=0.1) is None
+        assert sub_b.get(timeout=0.1) is None
+
+    assert not broker._subscriptions
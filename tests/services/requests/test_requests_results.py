@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2022 CERN.
+#
+# Invenio-Requests is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Tests for the serialization of request results."""
+
+from invenio_records_resources.services import ServiceSchemaWrapper
+
+from invenio_requests.records.api import Request
+
+
+def test_cached_schema_wrapper(
+    app, identity_simple, create_request, submit_request, requests_service
+):
+    requests = [
+        Request.get_record(r.id)
+        for r in [create_request(identity_simple), submit_request(identity_simple)]
+    ]
+    schema = requests[0].type.marshmallow_schema()
+
+    # the wrapper is cached per request type
+    cached = requests_service._wrap_schema(schema)
+    assert requests_service._wrap_schema(schema) is cached
+    plain = ServiceSchemaWrapper(requests_service, schema)
+
+    def dump_all(wrapper):
+        return [
+            wrapper.dump(r, context={"identity": identity_simple, "record": r})
+            for r in requests
+        ]
+
+    # the cached wrapper dumps exactly the same data
+    assert dump_all(cached) == dump_all(plain)
+    assert dump_all(cached) == dump_all(cached)
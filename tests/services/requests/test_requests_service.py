@@ -9,15 +9,25 @@
 
 """Service tests."""
 
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
 import pytest
+from elasticsearch.helpers import bulk
 from invenio_access.permissions import system_identity
+from invenio_db import db
+from invenio_records_resources.services import ServiceSchemaWrapper
+from invenio_records_resources.services.errors import QuerystringValidationError
 
 from invenio_requests.customizations.default import DefaultRequestType
 from invenio_requests.records.api import (
+    Request,
     RequestEvent,
     RequestEventFormat,
     RequestEventType,
 )
+from invenio_requests.records.models import RequestNumber
+from invenio_requests.services.uow import commit_records, index_records
 
 
 def test_submit_request(app, identity_simple, submit_request, request_events_service):
@@ -33,6 +43,59 @@ def test_submit_request(app, identity_simple, submit_request, request_events_ser
     assert "Can I belong to the community?" == hits[0]["payload"]["content"]
 
 
+def test_activity_counters(
+    app, identity_simple, identity_simple_2, submit_request, requests_service,
+    request_events_service
+):
+    # submitting with a comment creates one event
+    request = submit_request(identity_simple)
+    request = Request.get_record(request.id)
+    assert (request.events_count, request.comments_count) == (1, 1)
+    first_activity = request.last_activity_at
+    assert first_activity is not None
+
+    # accepting with a comment creates the accept event and a comment
+    data = {
+        "payload": {
+            "content": "Welcome to the community!",
+            "format": RequestEventFormat.HTML.value,
+        }
+    }
+    revision_id = request.revision_id
+    result = requests_service.execute_action(
+        identity_simple_2, request.id, "accept", data
+    )
+    request = Request.get_record(request.id)
+    assert (request.events_count, request.comments_count) == (3, 2)
+    assert request.last_activity_at >= first_activity
+    # the action and the counters make up a single new revision
+    assert request.revision_id == revision_id + 1
+    assert result.to_dict()["revision_id"] == request.revision_id
+    assert result.to_dict()["events_count"] == 3
+
+    # deleted comments stay in the timeline, but aren't comments anymore
+    Request.index.refresh()
+    RequestEvent.index.refresh()
+    comment = next(
+        hit for hit in request_events_service.search(identity_simple, request.id).hits
+        if hit["type"] == RequestEventType.COMMENT.value
+        and hit["created_by"] == {"user": str(identity_simple.id)}
+    )
+    request_events_service.delete(identity_simple, comment["id"])
+    request = Request.get_record(request.id)
+    assert (request.events_count, request.comments_count) == (3, 1)
+
+    # the counters are indexed, too
+    Request.index.refresh()
+    hits = list(
+        requests_service.search(
+            identity_simple, params={"sort": "recent_activity"}
+        ).hits
+    )
+    hit = next(hit for hit in hits if hit["id"] == str(request.id))
+    assert (hit["events_count"], hit["comments_count"]) == (3, 1)
+
+
 def test_accept_request(
     app,
     identity_simple,
@@ -160,3 +223,353 @@ def test_update_request(app, identity_simple, submit_request, requests_service):
 
     request_dict = request.to_dict()
     assert "Zim boum ba" == request_dict["title"]
+
+
+class CustomNumberRequestType(DefaultRequestType):
+    """Request type with its own request number generator."""
+
+    type_id = "custom-number-request"
+
+    def generate_request_number(self, request, **kwargs):
+        """Generate a custom request number."""
+        return f"custom-{request.id}"
+
+
+@pytest.fixture()
+def custom_number_request_type(app, monkeypatch):
+    """Register the custom number request type for the duration of a test."""
+    registry = app.extensions["invenio-requests"].request_type_registry
+    type_ = CustomNumberRequestType()
+    # removed from the registry again on teardown
+    monkeypatch.setitem(registry._registered_types, type_.type_id, type_)
+    return type_
+
+
+def test_create_many(
+    app, identity_simple, users, request_record_input_data, requests_service,
+    custom_number_request_type
+):
+    items = [
+        {
+            "data": request_record_input_data,
+            "request_type": DefaultRequestType,
+            "receiver": users[1],
+        },
+        {
+            "data": {"title": "With topic"},
+            "request_type": DefaultRequestType,
+            "receiver": users[1],
+            "creator": users[1],
+            "topic": users[0],
+        },
+        {
+            "data": {"title": "Custom", "unknown": "field"},
+            "request_type": CustomNumberRequestType,
+            "receiver": users[1],
+        },
+    ]
+
+    service = requests_service
+    with patch.object(
+        service, "require_permission", wraps=service.require_permission
+    ) as require_permission, patch.object(
+        requests_service, "_wrap_schema", wraps=requests_service._wrap_schema
+    ) as wrap_schema, patch.object(
+        RequestNumber, "next_many", wraps=RequestNumber.next_many
+    ) as next_many, patch(
+        "invenio_requests.services.uow.bulk", wraps=bulk
+    ) as es_bulk, patch(
+        "invenio_requests.services.uow.commit_records", wraps=commit_records
+    ) as bulk_commit:
+        results = requests_service.create_many(identity_simple, items)
+
+    # one permission check, one schema per type, one batch of numbers
+    # (for the default types only), one commit and one bulk index request
+    require_permission.assert_called_once_with(identity_simple, "create")
+    assert wrap_schema.call_count == 2
+    next_many.assert_called_once_with(2)
+    bulk_commit.assert_called_once()
+    es_bulk.assert_called_once()
+
+    Request.index.refresh()
+    assert 3 == len(results)
+    default_1, default_2, custom = [r.to_dict() for r in results]
+    assert default_1["status"] == "draft"
+    assert default_1["created_by"] == {"user": "1"}
+    assert default_2["created_by"] == {"user": "2"}
+    assert default_2["topic"] == {"user": "1"}
+    assert default_1["number"] != default_2["number"]
+    assert custom["number"] == f"custom-{results[2].id}"
+
+    # validation errors are reported per item
+    assert not results[0].errors
+    assert results[2].errors
+
+    hits = requests_service.search(identity_simple).to_dict()["hits"]["hits"]
+    assert {results[0].id, results[2].id} <= {h["id"] for h in hits}
+
+
+def test_create_many_empty(app, identity_simple, requests_service):
+    assert requests_service.create_many(identity_simple, []) == []
+
+
+def test_create_many_invalid_item(
+    app, identity_simple, request_record_input_data, requests_service
+):
+    items = [{"data": request_record_input_data, "request_type": DefaultRequestType}]
+
+    with pytest.raises(ValueError):
+        requests_service.create_many(identity_simple, items)
+
+
+def test_rebuild_index(app, identity_simple, create_request, requests_service):
+    create_request(identity_simple)
+    deleted = create_request(identity_simple)
+    requests_service.delete(identity_simple, deleted.id)
+
+    model_cls = Request.model_cls
+    expected = model_cls.query.filter(model_cls.is_deleted != True).count()  # noqa
+
+    progress = []
+    indexed = requests_service.rebuild_index(
+        system_identity, batch_size=1, progress_callback=progress.append
+    )
+
+    assert indexed == expected
+    assert progress == list(range(1, expected + 1))
+
+
+def test_reindex(
+    app, identity_simple, create_request, submit_request, requests_service
+):
+    draft = create_request(identity_simple)
+    submitted = submit_request(identity_simple)
+    Request.index.refresh()
+
+    # only the matching requests get reindexed
+    with patch(
+        "invenio_requests.services.requests.service.index_records",
+        wraps=index_records,
+    ) as index:
+        indexed = requests_service.reindex(system_identity, params={"is_open": True})
+
+    reindexed_ids = {
+        str(record.id) for call in index.call_args_list for record in call.args[1]
+    }
+    assert indexed == len(reindexed_ids)
+    assert str(submitted.id) in reindexed_ids
+    assert str(draft.id) not in reindexed_ids
+
+
+def test_export(
+    app, identity_simple, create_request, submit_request, requests_service
+):
+    submitted = [submit_request(identity_simple) for _ in range(3)]
+    draft = create_request(identity_simple)
+    Request.index.refresh()
+
+    # the hits are fetched in several batches, and the pagination is ignored
+    result = requests_service.export(
+        system_identity, params={"is_open": True, "size": 1}, batch_size=2
+    )
+    hits = list(result.hits)
+
+    exported_ids = [hit["id"] for hit in hits]
+    assert len(exported_ids) == len(set(exported_ids))
+    assert {str(req.id) for req in submitted} <= set(exported_ids)
+    assert str(draft.id) not in exported_ids
+    assert all("links" in hit for hit in hits)
+
+
+def test_cursor_pagination(
+    app, identity_simple, submit_request, requests_service
+):
+    submitted = {str(submit_request(identity_simple).id) for _ in range(3)}
+    Request.index.refresh()
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"is_open": True, "size": 2, "sort": "newest"}
+        if cursor:
+            params["cursor"] = cursor
+        result = requests_service.search(system_identity, params=params)
+        seen.extend(hit["id"] for hit in result.hits)
+
+        cursor = result.next_cursor
+        if cursor is None:
+            break
+
+    assert len(seen) == len(set(seen))
+    assert submitted <= set(seen)
+
+    with pytest.raises(QuerystringValidationError):
+        requests_service.search(system_identity, params={"cursor": "invalid!"})
+
+
+def test_execute_action_many(
+    app,
+    identity_simple,
+    identity_simple_2,
+    create_request,
+    submit_request,
+    requests_service,
+    request_events_service,
+):
+    open_1 = submit_request(identity_simple)
+    open_2 = submit_request(identity_simple)
+    draft = create_request(identity_simple)
+    missing_id = "00000000-0000-0000-0000-000000000000"
+    data = {
+        "payload": {
+            "content": "Sorry but no.",
+            "format": RequestEventFormat.HTML.value,
+        }
+    }
+
+    with patch(
+        "invenio_requests.services.uow.bulk", wraps=bulk
+    ) as es_bulk, patch.object(
+        ServiceSchemaWrapper,
+        "load",
+        autospec=True,
+        side_effect=ServiceSchemaWrapper.load,
+    ) as load:
+        results = requests_service.execute_action_many(
+            identity_simple_2,
+            [open_1.id, open_2.number, draft.id, missing_id, "not-a-uuid"],
+            "decline",
+            data,
+        )
+
+    # one bulk request for requests and events, the comment is loaded once
+    assert es_bulk.call_count == 2
+    comment_type = RequestEventType.COMMENT.value
+    loaded_types = [call.args[1]["type"] for call in load.call_args_list]
+    assert loaded_types.count(comment_type) == 1
+
+    assert [r["success"] for r in results] == [True, True, False, False, False]
+    assert results[0]["item"].to_dict()["status"] == "declined"
+    assert results[1]["item"].id == str(open_2.id)
+    assert results[2]["id"] == str(draft.id)
+    assert "error" in results[2]
+    assert results[3]["id"] == missing_id
+    # invalid IDs are reported as not found, without aborting the batch
+    assert results[4] == {
+        "id": "not-a-uuid",
+        "success": False,
+        "error": "Request not found.",
+    }
+
+    RequestEvent.index.refresh()
+    events = request_events_service.search(identity_simple, open_1.id)
+    assert 3 == events.total  # submit comment + decline + comment
+
+    # the request that failed is unchanged
+    assert Request.get_record(draft.id).status == "draft"
+
+
+def test_expire_requests(app, identity_simple, submit_request, requests_service):
+    expired = submit_request(identity_simple)
+    not_expired = submit_request(identity_simple)
+    no_expiry = submit_request(identity_simple)
+
+    now = datetime.utcnow()
+    for request, expires_at in [
+        (expired, now - timedelta(days=1)),
+        (not_expired, now + timedelta(days=1)),
+    ]:
+        request = Request.get_record(request.id)
+        request.expires_at = expires_at
+        request.commit()
+    db.session.commit()
+
+    assert requests_service.expire_requests(system_identity, batch_size=1) == 1
+    assert Request.get_record(expired.id).status == "expired"
+    assert Request.get_record(not_expired.id).status == "open"
+    assert Request.get_record(no_expiry.id).status == "open"
+
+    # already expired requests are not visited again
+    assert requests_service.expire_requests(system_identity) == 0
+
+
+def test_iter_expired_request_ids(
+    app, identity_simple, submit_request, requests_service
+):
+    now = datetime.utcnow()
+    requests = [submit_request(identity_simple) for _ in range(3)]
+    # two of the requests expire at the same time
+    expiration_dates = [now - timedelta(days=1)] * 2 + [now - timedelta(days=2)]
+    for request, expires_at in zip(requests, expiration_dates):
+        request = Request.get_record(request.id)
+        request.expires_at = expires_at
+        request.commit()
+    db.session.commit()
+
+    # the chunks are ordered by expiration date and ID, without duplicates
+    chunks = list(requests_service._iter_expired_request_ids(1, now=now))
+    assert all(len(chunk) == 1 for chunk in chunks)
+    ids = {r.id for r in requests}
+    expected = [requests[2].id] + sorted(r.id for r in requests[:2])
+    assert [chunk[0] for chunk in chunks if chunk[0] in ids] == expected
+
+
+def test_read_many(
+    app, identity_simple, identity_simple_2, create_request, submit_request,
+    requests_service
+):
+    draft = create_request(identity_simple)
+    open_ = submit_request(identity_simple)
+    missing_id = "00000000-0000-0000-0000-000000000000"
+    values = [open_.number, missing_id, draft.id, "XXXXX"]
+
+    # the creator can read both requests, in the given order
+    results = requests_service.read_many(identity_simple, values)
+    assert results.total == 2
+    assert [hit["id"] for hit in results.hits] == [str(open_.id), str(draft.id)]
+    assert "self" in results.to_dict()["hits"]["hits"][0]["links"]
+
+    # the receiver can only read the open request
+    results = requests_service.read_many(identity_simple_2, values)
+    assert [hit["number"] for hit in results.hits] == [open_.number]
+
+    assert requests_service.read_many(identity_simple, []).total == 0
+
+
+def test_read_and_execute_action_by_number(
+    app, identity_simple, create_request, requests_service
+):
+    request = create_request(identity_simple)
+
+    item = requests_service.read(identity_simple, request.number)
+    assert item.id == str(request.id)
+
+    item = requests_service.execute_action(identity_simple, request.number, "submit")
+    assert item.to_dict()["status"] == "open"
+
+
+def test_sparse_fieldsets(
+    app, identity_simple, submit_request, requests_service, request_events_service
+):
+    request = submit_request(identity_simple)
+    Request.index.refresh()
+    RequestEvent.index.refresh()
+
+    item = requests_service.read(identity_simple, request.id, fields="id,status")
+    assert item.to_dict() == {"id": str(request.id), "status": "open"}
+
+    item = requests_service.read(identity_simple, request.id, fields="title,links.self")
+    assert set(item.to_dict()) == {"title", "links"}
+    assert list(item.to_dict()["links"]) == ["self"]
+
+    results = requests_service.search(
+        identity_simple, params={"fields": "number,status,links"}
+    )
+    hits = list(results.hits)
+    assert set(hits[0]) == {"number", "status", "links"}
+    assert "actions" in hits[0]["links"]
+
+    results = request_events_service.search(
+        identity_simple, request.id, params={"fields": "type,payload"}
+    )
+    assert [set(hit) for hit in results.hits] == [{"type", "payload"}]
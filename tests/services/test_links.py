@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2022 CERN.
+#
+# Invenio-Requests is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Tests for the precompiled links."""
+
+from types import SimpleNamespace
+
+import pytest
+from invenio_records_resources.services.base.links import Link
+
+from invenio_requests.services.links import CompiledLink, compile_template
+
+
+def test_compile_template():
+    """Test the compilation of URI templates."""
+    assert compile_template("{+api}/requests/{id}") == (
+        "{api}/requests/{id}",
+        [("api", True), ("id", False)],
+    )
+    assert compile_template("/static") == ("/static", [])
+
+    # templates with operators aren't compiled
+    assert compile_template("{+api}/requests{?args*}") is None
+    assert compile_template("{+api}/requests/{id,action}") is None
+
+
+@pytest.mark.parametrize("template", [
+    "{+api}/requests/{id}",
+    "{+api}/requests/{id}/actions/{action}",
+    "{+api}/requests{?args*}",
+])
+def test_compiled_link_matches_uritemplate(app, template):
+    """Test that compiled links expand like the URI template engine."""
+    obj = SimpleNamespace(id="a b/c?d")
+    ctx = {
+        "api": "https://127.0.0.1:5000/api",
+        "action": "accept",
+        "args": {"q": "x y"},
+    }
+
+    def vars(obj, vars):
+        vars["id"] = obj.id
+
+    assert CompiledLink(template, vars=vars).expand(obj, ctx) == \
+        Link(template, vars=vars).expand(obj, ctx)
+
+
+def test_relative_links(app):
+    """Test that links can be rendered without scheme and host."""
+    link = CompiledLink("{+api}/requests/{id}")
+    obj = SimpleNamespace()
+    ctx = {"api": "https://127.0.0.1:5000/api", "id": "1234"}
+
+    assert link.expand(obj, ctx) == "https://127.0.0.1:5000/api/requests/1234"
+
+    app.config["REQUESTS_LINKS_RELATIVE"] = True
+    try:
+        assert link.expand(obj, ctx) == "/api/requests/1234"
+    finally:
+        app.config["REQUESTS_LINKS_RELATIVE"] = False
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2022 CERN.
+#
+# Invenio-Requests is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Unit of work operations tests."""
+
+from unittest.mock import Mock, patch
+
+import pytest
+from invenio_records_resources.services.uow import UnitOfWork
+
+from invenio_requests.proxies import current_requests_service
+from invenio_requests.records.api import Request, RequestEvent
+from invenio_requests.services.uow import RecordIndexOp, index_records
+
+
+def _mock_indexer(record_cls):
+    indexer = Mock()
+    indexer.record_cls = record_cls
+    return indexer
+
+
+@pytest.mark.parametrize(
+    "strategy,arguments",
+    [
+        ("none", {}),
+        ("wait_for", {"refresh": "wait_for"}),
+        ("immediate", {"refresh": True}),
+    ],
+)
+def test_refresh_strategies(app, example_request, strategy, arguments):
+    indexer = _mock_indexer(Request)
+    with UnitOfWork() as uow:
+        uow.register(
+            RecordIndexOp(example_request, indexer=indexer, index_refresh=strategy)
+        )
+        uow.commit()
+
+    indexer.index.assert_called_once_with(example_request, arguments=arguments)
+    indexer.refresh.assert_not_called()
+
+
+def test_coalesced_refresh(app, example_request):
+    requests_indexer = _mock_indexer(Request)
+    events_indexer = _mock_indexer(RequestEvent)
+    with UnitOfWork() as uow:
+        for indexer in (requests_indexer, events_indexer, requests_indexer):
+            uow.register(
+                RecordIndexOp(
+                    example_request, indexer=indexer, index_refresh="coalesced"
+                )
+            )
+        uow.commit()
+
+    # each index is refreshed once, after all records have been indexed
+    assert requests_indexer.index.call_count == 2
+    requests_indexer.refresh.assert_called_once_with()
+    events_indexer.refresh.assert_called_once_with()
+
+
+def test_configured_refresh_strategy(app, monkeypatch, example_request):
+    monkeypatch.setitem(app.config, "REQUESTS_INDEX_REFRESH", "wait_for")
+    indexer = _mock_indexer(Request)
+    with UnitOfWork() as uow:
+        uow.register(RecordIndexOp(example_request, indexer=indexer))
+        uow.commit()
+    indexer.index.assert_called_once_with(
+        example_request, arguments={"refresh": "wait_for"}
+    )
+
+    monkeypatch.setitem(app.config, "REQUESTS_INDEX_REFRESH", "sometimes")
+    with pytest.raises(ValueError):
+        RecordIndexOp(example_request, indexer=indexer)
+
+
+def test_index_records_uses_loaded_records(app, example_request):
+    indexer = current_requests_service.indexer
+    records = Request.get_records([example_request.id])
+    # the records are not loaded one by one again
+    with patch.object(Request, "get_record") as get_record:
+        assert index_records(indexer, records) == 1
+    get_record.assert_not_called()